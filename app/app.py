@@ -63,26 +63,31 @@ def _load_module_at(module_name: str, file_path: Path):
 
 try:
     from queries import (
+        RESULT_CACHE_TTL_S,
         get_bump_drilldown_state_summary,
         get_consistency_runs,
+        get_county_choropleth,
         get_cube_summary,
+        get_daily_cube_counts,
+        get_daily_cube_refresh_token,
+        get_declaration_name_groupings,
         get_disaster_date_bounds,
         get_distinct_disaster_types,
-        get_drilldown,
         get_dynamic_table_metadata,
         call_choropleth_assistant,
-        get_name_grouping_cache,
-        get_sankey_rows,
+        get_sankey_flows,
+        get_sankey_rows_with_cache,
         get_state_choropleth,
         get_sunburst_rows,
         get_sankey_cache_status_by_year,
         get_task_history,
         get_task_status,
-        get_trends_bump_ranks,
+        get_trends_month_type_counts,
+        is_missing_object_error,
+        upsert_declaration_name_groupings,
         upsert_name_grouping_cache,
     )
     from llm import (
-        summarize_bump_entry,
         group_declaration_names,
         group_sankey_names,
         summarize_year_events,
@@ -93,36 +98,79 @@ try:
     from viz import (
         build_bump_chart,
         build_choropleth,
+        build_county_choropleth,
         build_cube_grid,
         build_drilldown,
         build_sunburst,
+        load_county_geojson,
+    )
+    from sankey import (
+        DEFAULT_MAX_NODES as DEFAULT_SANKEY_MAX_NODES,
+        build_sankey_graph,
+        build_sankey_graph_from_flows,
+        collapse_sankey_nodes,
+        render_sankey,
+    )
+    from cube import CountCube
+    from display_names import drilldown_display_names, name_date_ranges
+    from prefetch import (
+        get_cached_summary,
+        get_drilldown_prefetched,
+        get_summary_prefetched,
+        prefetch_drilldowns,
+        prefetch_summaries,
+        refresh_sankey_flows_in_background,
+    )
+    from trends import (
+        TRENDS_DEFAULT_MONTH_END,
+        TRENDS_DEFAULT_MONTH_START,
+        TRENDS_FIRST_YEAR,
+        bump_period_label,
+        rank_bump_periods,
+    )
+    from narratives import bump_narrative_inputs, get_bump_narrative
+    from sunburst import (
+        SUNBURST_CUSTOMDATA_COLUMNS,
+        SunburstTree,
+        build_sunburst_nodes,
+        sunburst_node_selection,
     )
-    from sankey import render_sankey
     from views.about import render_about
 except ImportError:
     queries = _load_module("app_queries", "queries.py")
     llm = _load_module("app_llm", "llm.py")
     viz = _load_module("app_viz", "viz.py")
     sankey = _load_module("app_sankey", "sankey.py")
+    prefetch = _load_module("app_prefetch", "prefetch.py")
+    cube = _load_module("app_cube", "cube.py")
+    display_names = _load_module("app_display_names", "display_names.py")
+    trends = _load_module("app_trends", "trends.py")
+    narratives = _load_module("app_narratives", "narratives.py")
+    sunburst = _load_module("app_sunburst", "sunburst.py")
     about = _load_module_at("app_about", repo_root / "views" / "about.py")
+    RESULT_CACHE_TTL_S = queries.RESULT_CACHE_TTL_S
     get_bump_drilldown_state_summary = queries.get_bump_drilldown_state_summary
     get_consistency_runs = queries.get_consistency_runs
+    get_county_choropleth = queries.get_county_choropleth
     get_cube_summary = queries.get_cube_summary
+    get_daily_cube_counts = queries.get_daily_cube_counts
+    get_daily_cube_refresh_token = queries.get_daily_cube_refresh_token
+    get_declaration_name_groupings = queries.get_declaration_name_groupings
     get_disaster_date_bounds = queries.get_disaster_date_bounds
     get_distinct_disaster_types = queries.get_distinct_disaster_types
-    get_drilldown = queries.get_drilldown
     get_dynamic_table_metadata = queries.get_dynamic_table_metadata
     call_choropleth_assistant = queries.call_choropleth_assistant
-    get_name_grouping_cache = queries.get_name_grouping_cache
-    get_sankey_rows = queries.get_sankey_rows
+    get_sankey_flows = queries.get_sankey_flows
+    get_sankey_rows_with_cache = queries.get_sankey_rows_with_cache
     get_state_choropleth = queries.get_state_choropleth
     get_sunburst_rows = queries.get_sunburst_rows
     get_sankey_cache_status_by_year = queries.get_sankey_cache_status_by_year
     get_task_history = queries.get_task_history
     get_task_status = queries.get_task_status
-    get_trends_bump_ranks = queries.get_trends_bump_ranks
+    get_trends_month_type_counts = queries.get_trends_month_type_counts
+    is_missing_object_error = queries.is_missing_object_error
+    upsert_declaration_name_groupings = queries.upsert_declaration_name_groupings
     upsert_name_grouping_cache = queries.upsert_name_grouping_cache
-    summarize_bump_entry = llm.summarize_bump_entry
     group_declaration_names = llm.group_declaration_names
     group_sankey_names = llm.group_sankey_names
     summarize_year_events = llm.summarize_year_events
@@ -131,10 +179,36 @@ except ImportError:
     summarize_event_state = llm.summarize_event_state
     build_bump_chart = viz.build_bump_chart
     build_choropleth = viz.build_choropleth
+    build_county_choropleth = viz.build_county_choropleth
     build_cube_grid = viz.build_cube_grid
+    load_county_geojson = viz.load_county_geojson
     build_drilldown = viz.build_drilldown
     build_sunburst = viz.build_sunburst
+    DEFAULT_SANKEY_MAX_NODES = sankey.DEFAULT_MAX_NODES
+    build_sankey_graph = sankey.build_sankey_graph
+    build_sankey_graph_from_flows = sankey.build_sankey_graph_from_flows
+    collapse_sankey_nodes = sankey.collapse_sankey_nodes
     render_sankey = sankey.render_sankey
+    CountCube = cube.CountCube
+    drilldown_display_names = display_names.drilldown_display_names
+    name_date_ranges = display_names.name_date_ranges
+    get_drilldown_prefetched = prefetch.get_drilldown_prefetched
+    prefetch_drilldowns = prefetch.prefetch_drilldowns
+    get_cached_summary = prefetch.get_cached_summary
+    get_summary_prefetched = prefetch.get_summary_prefetched
+    prefetch_summaries = prefetch.prefetch_summaries
+    refresh_sankey_flows_in_background = prefetch.refresh_sankey_flows_in_background
+    TRENDS_DEFAULT_MONTH_END = trends.TRENDS_DEFAULT_MONTH_END
+    TRENDS_DEFAULT_MONTH_START = trends.TRENDS_DEFAULT_MONTH_START
+    TRENDS_FIRST_YEAR = trends.TRENDS_FIRST_YEAR
+    bump_period_label = trends.bump_period_label
+    rank_bump_periods = trends.rank_bump_periods
+    bump_narrative_inputs = narratives.bump_narrative_inputs
+    get_bump_narrative = narratives.get_bump_narrative
+    SUNBURST_CUSTOMDATA_COLUMNS = sunburst.SUNBURST_CUSTOMDATA_COLUMNS
+    SunburstTree = sunburst.SunburstTree
+    build_sunburst_nodes = sunburst.build_sunburst_nodes
+    sunburst_node_selection = sunburst.sunburst_node_selection
     render_about = about.render_about
 
 
@@ -170,7 +244,208 @@ def _year_range_to_dates(year_range: tuple[int, int]) -> tuple[dt.date, dt.date]
     return start_date, end_date
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _count_cube_refresh_token() -> str:
+    try:
+        return get_daily_cube_refresh_token()
+    except Exception:
+        return ""
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _load_count_cube(refresh_token: str) -> Optional[CountCube]:
+    # Reloaded only when the daily cube dynamic table refreshes; None means the table
+    # is not deployed and Map View falls back to per-slice warehouse queries.
+    if not refresh_token:
+        return None
+    try:
+        return CountCube.from_frame(get_daily_cube_counts().df, refresh_token)
+    except Exception:
+        return None
+
+
+def _state_choropleth_df(
+    start_date: dt.date,
+    end_date: dt.date,
+    disaster_types: Optional[List[str]],
+) -> pd.DataFrame:
+    count_cube = _load_count_cube(_count_cube_refresh_token())
+    if count_cube is not None:
+        return count_cube.state_totals(start_date.isoformat(), end_date.isoformat(), disaster_types)
+    return get_state_choropleth(start_date.isoformat(), end_date.isoformat(), disaster_types).df
+
+
+def _cube_summary_df(
+    state: str,
+    start_date: dt.date,
+    end_date: dt.date,
+    grain: str,
+    disaster_types: Optional[List[str]],
+) -> pd.DataFrame:
+    count_cube = _load_count_cube(_count_cube_refresh_token())
+    if count_cube is not None:
+        return count_cube.state_summary(
+            state, start_date.isoformat(), end_date.isoformat(), grain, disaster_types
+        )
+    return get_cube_summary(
+        state, start_date.isoformat(), end_date.isoformat(), grain, disaster_types
+    ).df
+
+
+
+
+def _sankey_max_nodes() -> int:
+    try:
+        return max(10, int(os.getenv("SANKEY_MAX_NODES", DEFAULT_SANKEY_MAX_NODES)))
+    except ValueError:
+        return DEFAULT_SANKEY_MAX_NODES
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_sankey_graph(
+    sankey_year: int,
+    sankey_types: tuple[str, ...],
+    cache_version: tuple,
+    max_nodes: int,
+    _df: pd.DataFrame,
+) -> tuple[list[dict], list[dict], int]:
+    # Keyed on the filters and cache state only; _df is not hashed by Streamlit.
+    nodes, links = build_sankey_graph(_df)
+    return collapse_sankey_nodes(nodes, links, max_nodes=max_nodes)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_sankey_flows_graph(
+    sankey_year: int,
+    sankey_types: tuple[str, ...],
+    flows_version: tuple,
+    max_nodes: int,
+    _flows: pd.DataFrame,
+) -> tuple[list[dict], list[dict], int]:
+    nodes, links = build_sankey_graph_from_flows(_flows)
+    return collapse_sankey_nodes(nodes, links, max_nodes=max_nodes)
+
+
+@st.cache_data(ttl=RESULT_CACHE_TTL_S, show_spinner=False, max_entries=32)
+def _cached_sunburst_nodes(
+    start_date: str,
+    end_date: str,
+    disaster_types: Optional[tuple[str, ...]],
+    name_map_version: str,
+    year_color_items: tuple[tuple[str, str], ...],
+    _df: pd.DataFrame,
+) -> tuple[pd.DataFrame, SunburstTree]:
+    # _df is determined by the query range, types and event-name mapping until the cached
+    # Silver rows behind it expire, so entries share that TTL. The tree index is built
+    # once per node set so focusing a node only slices its subtree.
+    nodes = build_sunburst_nodes(_df, dict(year_color_items))
+    return nodes, SunburstTree.from_nodes(nodes)
+
+
+SUNBURST_PREFETCH_MAX_YEARS = 8
+SUNBURST_PREFETCH_TOP_EVENTS = 5
+
+
+def _impact_summary_inputs(df: pd.DataFrame, node: dict) -> Optional[tuple]:
+    node_type = node.get("node_type")
+    year_str = node.get("year")
+    year_int = int(year_str) if year_str and str(year_str).isdigit() else None
+    event_name = node.get("event")
+    state = node.get("state")
+    if year_int is None:
+        return None
+    year_df = df[df["year"] == str(year_int)]
+    if node_type == "year":
+        top_types = list(year_df["disaster_type"].value_counts().head(8).items())
+        top_events = list(
+            year_df[year_df["event"] != "Other/Unnamed"]["event"].value_counts().head(8).items()
+        )
+        return (
+            f"sunburst:year:{year_int}",
+            "Summarizing year events...",
+            summarize_year_events,
+            (year_int, top_types, top_events),
+        )
+    if node_type not in {"event", "state"} or (node_type == "state" and not event_name):
+        return None
+    if event_name == "Other/Unnamed":
+        unnamed_df = year_df[year_df["event"] == "Other/Unnamed"]
+        top_types = list(unnamed_df["disaster_type"].value_counts().head(8).items())
+        return (
+            f"sunburst:unnamed:{year_int}",
+            "Summarizing unnamed events...",
+            summarize_unnamed_events,
+            (year_int, top_types),
+        )
+    if node_type == "event":
+        event_df = year_df[year_df["event"] == event_name]
+        top_states = list(event_df["state"].value_counts().head(8).items())
+        return (
+            f"sunburst:event:{year_int}:{event_name}",
+            "Summarizing named event...",
+            summarize_named_event,
+            (event_name, year_int, top_states),
+        )
+    return (
+        f"sunburst:state:{year_int}:{event_name}:{state}",
+        "Summarizing event in state...",
+        summarize_event_state,
+        (event_name, state, year_int),
+    )
+
+
+def _impact_summary_request(df: pd.DataFrame, node: dict) -> Optional[tuple]:
+    # Shared by the Impact Assessment dialog and the background prefetch. The summary
+    # cache is process-wide while the prompt inputs depend on each session's type filter
+    # and name grouping, so the key hashes the inputs rather than just naming the node.
+    inputs = _impact_summary_inputs(df, node)
+    if inputs is None:
+        return None
+    label, spinner_text, summarize, args = inputs
+    digest = hashlib.sha256(
+        json.dumps([summarize.__name__, args], default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{label}:{digest}", spinner_text, summarize, args
+
+
+def _prefetch_impact_summaries(df: pd.DataFrame, nodes: pd.DataFrame) -> None:
+    if not os.getenv("OPENAI_API_KEY"):
+        return
+    year_nodes = (
+        nodes[nodes["node_type"] == "year"]
+        .groupby("year")["value"]
+        .sum()
+        .nlargest(SUNBURST_PREFETCH_MAX_YEARS)
+    )
+    event_nodes = nodes[nodes["node_type"] == "event"].nlargest(
+        SUNBURST_PREFETCH_TOP_EVENTS, "value"
+    )
+    visible_nodes = [{"node_type": "year", "year": year} for year in year_nodes.index] + [
+        {"node_type": "event", "year": year, "event": event}
+        for year, event in zip(event_nodes["year"], event_nodes["event"])
+    ]
+    summary_requests = []
+    for node in visible_nodes:
+        request = _impact_summary_request(df, node)
+        if request is not None:
+            cache_key, _, summarize, args = request
+            summary_requests.append((cache_key, summarize, args))
+    prefetch_summaries(summary_requests)
+
 
+def _render_sankey_graph(nodes: list[dict], links: list[dict], collapsed_count: int) -> None:
+    st.caption("Flow: Theme → Event → State")
+    if collapsed_count:
+        st.caption(
+            f"Showing the largest {len(nodes)} nodes; {collapsed_count} smaller themes, "
+            "events and states are grouped under \"Other\"."
+        )
+    sankey_height = 900
+    components.html(
+        render_sankey(nodes, links, height=sankey_height),
+        height=sankey_height + 20,
+        scrolling=True,
+    )
 
 def _render_sankey_content(
     sankey_year: int,
@@ -180,9 +455,32 @@ def _render_sankey_content(
         st.info("No disaster types available to render the Sankey view.")
         return
 
+    # Fully cached years are materialized in Gold; read those edges directly.
+    flows = get_sankey_flows(sankey_year, sankey_types).df
+    if not flows.empty:
+        flows["county_count"] = pd.to_numeric(flows["county_count"], errors="coerce").fillna(0)
+        for col in (
+            "begin_date_min",
+            "end_date_max",
+            "declaration_date_min",
+            "declaration_date_max",
+        ):
+            flows[col] = pd.to_datetime(flows[col], errors="coerce")
+        st.caption("Name grouping cache status: complete (precomputed flows).")
+        flows_version = (str(flows["refreshed_at"].max()), int(flows.shape[0]))
+        nodes, links, collapsed_count = _cached_sankey_flows_graph(
+            sankey_year,
+            tuple(sankey_types),
+            flows_version,
+            _sankey_max_nodes(),
+            flows,
+        )
+        _render_sankey_graph(nodes, links, collapsed_count)
+        return
+
     sankey_start = dt.date(sankey_year, 1, 1)
     sankey_end = dt.date(sankey_year + 1, 1, 1)
-    sankey_result = get_sankey_rows(
+    sankey_result = get_sankey_rows_with_cache(
         sankey_start.isoformat(),
         sankey_end.isoformat(),
         sankey_types,
@@ -193,59 +491,13 @@ def _render_sankey_content(
 
     df = sankey_result.df.copy()
     df["county_count"] = pd.to_numeric(df.get("county_count"), errors="coerce").fillna(0)
-    df["record_id"] = df.apply(
-        lambda row: hashlib.sha256(
-            f"{row['disaster_type']}|{row['declaration_name']}|{row['state']}".encode("utf-8")
-        ).hexdigest(),
-        axis=1,
-    )
     df["state"] = df["state"].fillna("Unknown").astype(str).str.strip()
     df["declaration_name"] = df["declaration_name"].fillna("").astype(str).str.strip()
     df["disaster_declaration_date"] = pd.to_datetime(df["disaster_declaration_date"])
     df["disaster_begin_date"] = pd.to_datetime(df.get("disaster_begin_date"), errors="coerce")
     df["disaster_end_date"] = pd.to_datetime(df.get("disaster_end_date"), errors="coerce")
     df["year"] = df["disaster_declaration_date"].dt.year.astype(int).astype(str)
-    df["source_text_hash"] = df.apply(
-        lambda row: hashlib.sha256(
-            f"{row['disaster_type']}|{row['declaration_name']}".encode("utf-8")
-        ).hexdigest(),
-        axis=1,
-    )
-
-    record_ids = sorted(df["record_id"].unique().tolist())
-    cache_result = get_name_grouping_cache(record_ids)
-    cache_df = cache_result.df.copy()
-    if cache_df.empty:
-        cache_df = pd.DataFrame(
-            columns=[
-                "record_id",
-                "cache_source_text_hash",
-                "cache_name_group",
-                "cache_theme_group",
-                "cache_theme_confidence",
-                "cache_is_named_event",
-                "cache_canonical_event_name",
-                "cache_confidence",
-                "cache_llm_model",
-            ]
-        )
-    else:
-        cache_df = cache_df.rename(
-            columns={
-                "source_text_hash": "cache_source_text_hash",
-                "name_group": "cache_name_group",
-                "theme_group": "cache_theme_group",
-                "theme_confidence": "cache_theme_confidence",
-                "is_named_event": "cache_is_named_event",
-                "canonical_event_name": "cache_canonical_event_name",
-                "confidence": "cache_confidence",
-                "llm_model": "cache_llm_model",
-            }
-        )
-    df = df.merge(cache_df, on="record_id", how="left")
-    needs_enrich = df["cache_source_text_hash"].isna() | (
-        df["cache_source_text_hash"] != df["source_text_hash"]
-    )
+    needs_enrich = df["needs_enrich"].astype(bool)
     missing_records = (
         df.loc[
             needs_enrich,
@@ -366,14 +618,8 @@ def _render_sankey_content(
                 on="record_id",
                 how="left",
             )
-    record_status = df.drop_duplicates(subset=["record_id"])[
-        ["record_id", "cache_source_text_hash", "source_text_hash"]
-    ]
-    cached_count = int(
-        (record_status["cache_source_text_hash"].notna()
-         & (record_status["cache_source_text_hash"] == record_status["source_text_hash"])
-        ).sum()
-    )
+    record_status = df.drop_duplicates(subset=["record_id"])
+    cached_count = int((~record_status["needs_enrich"].astype(bool)).sum())
     total_count = int(record_status.shape[0])
     enriched_count = len(llm_rows)
     remaining_count = max(total_count - cached_count - enriched_count, 0)
@@ -383,237 +629,39 @@ def _render_sankey_content(
         f"enriched {enriched_count}, "
         f"remaining {remaining_count}."
     )
-    df["canonical_event_name"] = df["cache_canonical_event_name"]
-    if "llm_canonical_event_name" in df.columns:
-        df["canonical_event_name"] = df["canonical_event_name"].combine_first(
-            df["llm_canonical_event_name"]
-        )
-
-    df["name_group"] = df["cache_name_group"]
-    if "llm_name_group" in df.columns:
-        df["name_group"] = df["name_group"].combine_first(df["llm_name_group"])
-    missing_name = df["name_group"].isna() | (df["name_group"].astype(str).str.strip() == "")
-    if missing_name.any():
-        df.loc[missing_name, "name_group"] = "Unnamed"
-
-    named_tokens = {"named", "named event", "named events"}
-
-    def _normalize_name_group(row: pd.Series) -> str:
-        name_group = str(row.get("name_group", "")).strip()
-        if name_group == "Unnamed":
-            dtype = str(row.get("disaster_type", "")).strip()
-            return f"Unnamed ({dtype})" if dtype else "Unnamed"
-        if name_group.lower() in named_tokens:
-            candidate = (
-                row.get("canonical_event_name")
-                or row.get("declaration_name")
-                or "Unnamed"
-            )
-            candidate = str(candidate).strip()
-            return candidate if candidate else "Unnamed"
-        return name_group
-
-    df["name_group"] = df.apply(_normalize_name_group, axis=1)
-
-    df["event_name"] = (
-        df["canonical_event_name"]
-        .fillna(df["declaration_name"])
-        .fillna("Unnamed")
-        .astype(str)
-        .str.strip()
+    cache_version = (
+        str(df["cache_updated_at"].max()),
+        cached_count,
+        enriched_count,
+        total_count,
+        float(df["county_count"].sum()),
     )
-    df.loc[df["event_name"] == "", "event_name"] = "Unnamed"
-
-    def _format_event_range(row: pd.Series) -> str:
-        start = row.get("disaster_begin_date")
-        end = row.get("disaster_end_date")
-        if pd.isna(start) and pd.isna(end):
-            start = row.get("disaster_declaration_date")
-            end = row.get("disaster_declaration_date")
-        if pd.isna(start) and pd.isna(end):
-            return "Unknown date"
-        if pd.isna(end) or start == end:
-            return pd.to_datetime(start).strftime("%Y-%m-%d")
-        return (
-            f"{pd.to_datetime(start).strftime('%Y-%m-%d')} "
-            f"to {pd.to_datetime(end).strftime('%Y-%m-%d')}"
-        )
-
-    df["event_tooltip"] = None
-    fire_mask = df["disaster_type"].astype(str).str.lower().eq("fire")
-    if fire_mask.any():
-        fire_df = df.loc[fire_mask].copy()
-        fire_df["event_date"] = fire_df["disaster_begin_date"]
-        fire_df.loc[fire_df["event_date"].isna(), "event_date"] = fire_df[
-            "disaster_declaration_date"
-        ]
-        fire_df.loc[fire_df["event_date"].isna(), "event_date"] = fire_df[
-            "disaster_end_date"
-        ]
-        fire_df = fire_df.sort_values(["state", "event_date"]).reset_index()
-        cluster_ids = []
-        current_state = None
-        cluster_start = None
-        cluster_id = 0
-        for _, row in fire_df.iterrows():
-            state = row["state"]
-            event_date = row["event_date"]
-            if current_state != state:
-                current_state = state
-                cluster_id = 0
-                cluster_start = event_date
-            if (
-                cluster_start is not None
-                and event_date is not None
-                and not pd.isna(cluster_start)
-                and not pd.isna(event_date)
-                and (event_date - cluster_start).days > 92
-            ):
-                cluster_id += 1
-                cluster_start = event_date
-            cluster_ids.append(cluster_id)
-        fire_df["fire_cluster_id"] = cluster_ids
-        fire_df["cluster_key"] = (
-            fire_df["state"].astype(str) + "|" + fire_df["fire_cluster_id"].astype(str)
-        )
-        cluster_labels = {}
-        cluster_tooltips = {}
-        for cluster_key, group in fire_df.groupby("cluster_key"):
-            event_names = (
-                group["event_name"].dropna().astype(str).str.strip().unique().tolist()
-            )
-            label = "Fire Cluster (" + "; ".join(event_names) + ")"
-            cluster_labels[cluster_key] = label
-            tooltip_lines = []
-            for _, row in group.iterrows():
-                tooltip_lines.append(
-                    f"{row['event_name']}: {_format_event_range(row)}"
-                )
-            cluster_tooltips[cluster_key] = "\n".join(tooltip_lines)
-        fire_df["name_group"] = fire_df["cluster_key"].map(cluster_labels)
-        df.loc[fire_df["index"], "name_group"] = fire_df["name_group"].values
-
-    def _event_range_for_group(group: pd.DataFrame) -> str:
-        start_min = group["disaster_begin_date"].min()
-        end_max = group["disaster_end_date"].max()
-        decl_min = group["disaster_declaration_date"].min()
-        decl_max = group["disaster_declaration_date"].max()
-        if pd.isna(start_min) and pd.isna(end_max):
-            start_min = decl_min
-            end_max = decl_max
-        if pd.isna(start_min) and pd.isna(end_max):
-            return "Unknown date"
-        if pd.isna(end_max) or start_min == end_max:
-            return pd.to_datetime(start_min).strftime("%Y-%m-%d")
-        return (
-            f"{pd.to_datetime(start_min).strftime('%Y-%m-%d')} "
-            f"to {pd.to_datetime(end_max).strftime('%Y-%m-%d')}"
-        )
-
-    df["theme_group"] = df["cache_theme_group"]
-    if "llm_theme_group" in df.columns:
-        df["theme_group"] = df["theme_group"].combine_first(df["llm_theme_group"])
-    missing_theme = df["theme_group"].isna() | (df["theme_group"].astype(str).str.strip() == "")
-    if missing_theme.any():
-        df.loc[missing_theme, "theme_group"] = "No Theme"
-
-    tooltip_parts = []
-    for (name_group, event_name), group in df.groupby(["name_group", "event_name"]):
-        tooltip_parts.append(
-            {
-                "name_group": name_group,
-                "tooltip_line": f"{event_name}: {_event_range_for_group(group)}",
-            }
+    # Refreshes are remembered per year and cache version, so newly enriched or added
+    # records trigger another one instead of the first success standing forever.
+    flow_refreshes = st.session_state.setdefault("sankey_flows_refreshes", {})
+    refresh_version, flow_refresh = flow_refreshes.get(sankey_year, (None, None))
+    if flow_refresh is not None and flow_refresh.done() and flow_refresh.exception() is not None:
+        # Forget the failed attempt so the next rerun retries it.
+        st.warning(
+            f"Refreshing precomputed Sankey flows for {sankey_year} failed: "
+            f"{flow_refresh.exception()}"
         )
-    tooltip_df = pd.DataFrame(tooltip_parts)
-    tooltip_counts = (
-        df.groupby("name_group")["county_count"]
-        .sum()
-        .to_dict()
-    )
-    event_tooltip_map = {}
-    for name_group, lines in tooltip_df.groupby("name_group")["tooltip_line"]:
-        total_count = int(tooltip_counts.get(name_group, 0))
-        tooltip_text = "\n".join(lines)
-        tooltip_text += (
-            f"\n(Total declared county-level disasters: {total_count})"
+        del flow_refreshes[sankey_year]
+    elif remaining_count == 0 and refresh_version != cache_version:
+        # Materialize the now-complete year so later renders read Gold flows.
+        flow_refreshes[sankey_year] = (
+            cache_version,
+            refresh_sankey_flows_in_background(sankey_year),
         )
-        event_tooltip_map[name_group] = tooltip_text
-
-    st.caption("Flow: Theme → Event → State")
-    theme_counts = (
-        df.groupby(["theme_group", "name_group"])["county_count"]
-        .sum()
-        .reset_index(name="value")
-    )
-    state_counts = (
-        df.groupby(["name_group", "state"])["county_count"]
-        .sum()
-        .reset_index(name="value")
+    nodes, links, collapsed_count = _cached_sankey_graph(
+        sankey_year,
+        tuple(sankey_types),
+        cache_version,
+        _sankey_max_nodes(),
+        df,
     )
 
-    nodes = []
-    node_ids = set()
-    node_lookup = {}
-
-    def _add_node(prefix: str, label: str, tooltip: Optional[str] = None) -> str:
-        node_id = f"{prefix}:{label}"
-        if node_id not in node_ids:
-            node_ids.add(node_id)
-            node = {"id": node_id, "name": label}
-            if tooltip:
-                node["tooltip"] = tooltip
-            nodes.append(node)
-            node_lookup[node_id] = node
-        elif tooltip and node_id in node_lookup and "tooltip" not in node_lookup[node_id]:
-            node_lookup[node_id]["tooltip"] = tooltip
-        return node_id
-
-    for row in theme_counts.itertuples(index=False):
-        _add_node("TH", str(row.theme_group))
-        _add_node(
-            "N",
-            str(row.name_group),
-            tooltip=event_tooltip_map.get(row.name_group),
-        )
-    for row in state_counts.itertuples(index=False):
-        _add_node(
-            "N",
-            str(row.name_group),
-            tooltip=event_tooltip_map.get(row.name_group),
-        )
-        _add_node("S", str(row.state))
-
-    links = []
-    for row in theme_counts.itertuples(index=False):
-        links.append(
-            {
-                "source": f"TH:{row.theme_group}",
-                "target": f"N:{row.name_group}",
-                "value": int(row.value),
-            }
-        )
-    for row in state_counts.itertuples(index=False):
-        links.append(
-            {
-                "source": f"N:{row.name_group}",
-                "target": f"S:{row.state}",
-                "value": int(row.value),
-            }
-        )
-
-    if len(nodes) > 400:
-        st.warning(
-            f"Too many nodes to render clearly ({len(nodes)}). Narrow the year range "
-            "or disaster type to reduce complexity."
-        )
-    else:
-        sankey_height = 900
-        components.html(
-            render_sankey(nodes, links, height=sankey_height),
-            height=sankey_height + 20,
-            scrolling=True,
-        )
+    _render_sankey_graph(nodes, links, collapsed_count)
 
 
 def _format_year_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -659,6 +707,12 @@ with tabs[1]:
             st.session_state.pop("selected_state_for_cube", None)
             st.session_state["explore_map_nonce"] = st.session_state.get("explore_map_nonce", 0) + 1
             st.rerun()
+        map_level = st.radio(
+            "Map level",
+            ["State", "County"],
+            horizontal=True,
+            key="filters_explore_map_level",
+        )
         explore_end_default = max_data_year
         explore_start_default = max(1953, explore_end_default - 2)
         explore_years = st.slider(
@@ -713,12 +767,24 @@ with tabs[1]:
             selected_cube = None
 
         with st.spinner("Loading choropleth..."):
-            choropleth_result = get_state_choropleth(
-                start_date.isoformat(),
-                end_date.isoformat(),
-                selected_types,
-            )
-            choropleth_fig = build_choropleth(choropleth_result.df)
+            county_level = "state" if selected_state else "national"
+            if map_level == "County" and load_county_geojson(county_level) is None:
+                st.info(
+                    "County outlines are not built yet; run "
+                    "`python scripts/build_county_geojson.py`. Showing states instead."
+                )
+                map_level = "State"
+            if map_level == "County":
+                county_df = get_county_choropleth(
+                    start_date.isoformat(),
+                    end_date.isoformat(),
+                    selected_types,
+                    state=selected_state,
+                ).df
+                choropleth_fig = build_county_choropleth(county_df, level=county_level)
+            else:
+                choropleth_df = _state_choropleth_df(start_date, end_date, selected_types)
+                choropleth_fig = build_choropleth(choropleth_df)
             choropleth_fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
             state_event = st.plotly_chart(
                 choropleth_fig,
@@ -729,7 +795,11 @@ with tabs[1]:
             )
 
         if state_event and state_event.selection and state_event.selection.points:
-            clicked_state = state_event.selection.points[0].get("location")
+            clicked_point = state_event.selection.points[0]
+            clicked_state = clicked_point.get("location")
+            if map_level == "County":
+                # County points carry the FIPS code as location; the state is customdata[0].
+                clicked_state = (clicked_point.get("customdata") or [None])[0]
             if clicked_state and clicked_state != st.session_state.get("selected_state"):
                 selected_state = clicked_state
                 st.session_state["selected_state"] = selected_state
@@ -741,15 +811,17 @@ with tabs[1]:
             st.subheader(
                 f"Disaster Summary by Period: {selected_state} (log-scaled size)"
             )
-            cube_result = get_cube_summary(
+            cube_df = _cube_summary_df(
                 selected_state,
-                start_date.isoformat(),
-                end_date.isoformat(),
+                start_date,
+                end_date,
                 grain,
                 selected_types,
             )
-            if not cube_result.df.empty:
-                cube_fig = build_cube_grid(cube_result.df, grain)
+            if not cube_df.empty:
+                # Warm the result cache for the biggest bubbles while the grid is on screen.
+                prefetch_drilldowns(selected_state, cube_df, grain)
+                cube_fig = build_cube_grid(cube_df, grain)
                 cube_fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
                 cube_event = st.plotly_chart(
                     cube_fig,
@@ -759,12 +831,14 @@ with tabs[1]:
                 )
                 if cube_event and cube_event.selection and cube_event.selection.points:
                     point = cube_event.selection.points[0]
-                    period_bucket = point.get("customdata")[0] if point.get("customdata") else None
+                    customdata = point.get("customdata") or []
+                    period_bucket = customdata[0] if customdata else None
                     if hasattr(period_bucket, "isoformat"):
                         period_bucket = period_bucket.isoformat()
                     selected_cube = {
                         "disaster_type": point.get("y"),
                         "period_bucket": period_bucket or point.get("x"),
+                        "disaster_count": customdata[3] if len(customdata) > 3 else None,
                     }
                     st.session_state["selected_cube"] = selected_cube
                     st.session_state["selected_state_for_cube"] = selected_state
@@ -773,12 +847,21 @@ with tabs[1]:
 
         if selected_state and selected_cube:
             st.subheader("Drilldown")
-            drilldown_result = get_drilldown(
+            drilldown_args = (
                 selected_state,
                 selected_cube["disaster_type"],
                 selected_cube["period_bucket"],
                 grain,
             )
+            drilldown_result, drilldown_aggregated, row_estimate = get_drilldown_prefetched(
+                *drilldown_args,
+                row_estimate=selected_cube.get("disaster_count"),
+            )
+            if drilldown_aggregated:
+                st.caption(
+                    f"{row_estimate:,} county-level records: showing one marker per "
+                    "county and declaration, sized by record count."
+                )
             if drilldown_result.df.empty:
                 st.info("No drilldown data returned.")
             else:
@@ -805,75 +888,7 @@ with tabs[1]:
                     "%Y-%m-%d"
                 )
 
-                generic_names = {
-                    "severe storm",
-                    "severe storms",
-                    "severe weather",
-                    "storm",
-                    "storms",
-                    "flood",
-                    "flooding",
-                    "wildfire",
-                    "wildfires",
-                    "snowstorm",
-                    "snowstorms",
-                    "winter storm",
-                    "winter storms",
-                    "tornado",
-                    "tornadoes",
-                    "hurricane",
-                    "tropical storm",
-                    "earthquake",
-                    "volcanic eruption",
-                    "volcano",
-                    "drought",
-                    "fire",
-                }
-
-                def _format_date_range(row: pd.Series) -> str:
-                    start = row.get("disaster_begin_date")
-                    end = row.get("disaster_end_date")
-                    if pd.isna(start) and pd.isna(end):
-                        start = row.get("disaster_declaration_date")
-                        end = row.get("disaster_declaration_date")
-                    if pd.isna(start) and pd.isna(end):
-                        return ""
-                    if pd.isna(end) or start == end:
-                        return pd.to_datetime(start).strftime("%Y-%m-%d")
-                    return (
-                        f"{pd.to_datetime(start).strftime('%Y-%m-%d')} "
-                        f"to {pd.to_datetime(end).strftime('%Y-%m-%d')}"
-                    )
-
-                def _is_generic_name(name: str, dtype: str) -> bool:
-                    cleaned = name.strip().lower()
-                    dtype_clean = (dtype or "").strip().lower()
-                    if cleaned in generic_names:
-                        return True
-                    if dtype_clean and cleaned == dtype_clean:
-                        return True
-                    if dtype_clean and cleaned.startswith(dtype_clean) and len(cleaned.split()) <= 2:
-                        return True
-                    return False
-
-                drilldown_df["display_name"] = drilldown_df["declaration_name"]
-                date_ranges = drilldown_df.apply(_format_date_range, axis=1)
-                generic_mask = drilldown_df.apply(
-                    lambda row: _is_generic_name(
-                        str(row.get("declaration_name", "")),
-                        str(row.get("disaster_type", "")),
-                    ),
-                    axis=1,
-                )
-                drilldown_df.loc[generic_mask, "display_name"] = (
-                    drilldown_df.loc[generic_mask, "declaration_name"]
-                    + " ("
-                    + date_ranges[generic_mask].fillna("")
-                    + ")"
-                )
-                drilldown_df["display_name"] = drilldown_df["display_name"].str.replace(
-                    " ()", "", regex=False
-                )
+                drilldown_df["display_name"] = drilldown_display_names(drilldown_df)
 
                 available_names = sorted(drilldown_df["display_name"].unique().tolist())
 
@@ -896,32 +911,7 @@ with tabs[1]:
                     + hashlib.md5(filter_sig.encode("utf-8")).hexdigest()
                 )
                 with st.expander("Declaration names", expanded=True):
-                    name_ranges = (
-                        drilldown_df.groupby("display_name", dropna=False)
-                        .agg(
-                            start_min=("disaster_begin_date", "min"),
-                            end_max=("disaster_end_date", "max"),
-                            decl_min=("disaster_declaration_date", "min"),
-                        )
-                        .reset_index()
-                    )
-                    name_range_map = {}
-                    for _, row in name_ranges.iterrows():
-                        start = row.get("start_min")
-                        end = row.get("end_max")
-                        if pd.isna(start) and pd.isna(end):
-                            start = row.get("decl_min")
-                            end = row.get("decl_min")
-                        if pd.isna(start) and pd.isna(end):
-                            range_text = ""
-                        elif pd.isna(end) or start == end:
-                            range_text = pd.to_datetime(start).strftime("%Y-%m-%d")
-                        else:
-                            range_text = (
-                                f"{pd.to_datetime(start).strftime('%Y-%m-%d')} "
-                                f"to {pd.to_datetime(end).strftime('%Y-%m-%d')}"
-                            )
-                        name_range_map[row["display_name"]] = range_text
+                    name_range_map = name_date_ranges(drilldown_df)
 
                     st.caption("Color mapping is shown in the chart legend.")
                     selected_names = []
@@ -1059,21 +1049,21 @@ with tabs[2]:
         if binning in {"decades", "years"}:
             trends_years = st.slider(
                 "Year range",
-                min_value=1953,
+                min_value=TRENDS_FIRST_YEAR,
                 max_value=max_data_year,
-                value=(1953, max_data_year),
+                value=(TRENDS_FIRST_YEAR, max_data_year),
                 key="filters_trends_year_range",
             )
             trends_start, trends_end = _year_range_to_dates(trends_years)
         else:
             trends_start = st.date_input(
                 "Start date",
-                value=dt.date(2023, 1, 1),
+                value=TRENDS_DEFAULT_MONTH_START,
                 key="filters_trends_start_date",
             )
             trends_end = st.date_input(
                 "End date",
-                value=dt.date(2025, 12, 31),
+                value=TRENDS_DEFAULT_MONTH_END,
                 key="filters_trends_end_date",
             )
             if trends_start > trends_end:
@@ -1083,16 +1073,17 @@ with tabs[2]:
     with content_col:
         chart_title = f"Top Disaster Types by {binning.title()} (Top {top_n})"
         st.caption(chart_title)
-        bump_result = get_trends_bump_ranks(
-            binning,
+        # Month x type counts are fetched once per date range; rebinning and top-N
+        # changes are recomputed locally.
+        month_counts = get_trends_month_type_counts(
             trends_start.isoformat(),
             trends_end.isoformat(),
-            top_n,
-        )
-        if bump_result.df.empty:
+        ).df
+        bump_df = rank_bump_periods(month_counts, binning, top_n)
+        if bump_df.empty:
             st.info("No bump chart data available.")
         else:
-            bump_fig = build_bump_chart(bump_result.df, binning=binning)
+            bump_fig = build_bump_chart(bump_df, binning=binning)
             bump_fig.update_layout(margin={"r": 0, "t": 20, "l": 0, "b": 0}, height=700)
             bump_event = st.plotly_chart(
                 bump_fig,
@@ -1117,26 +1108,9 @@ with tabs[2]:
 
             selected_bump = st.session_state.get("bump_selected")
             if selected_bump and selected_bump.get("period_bucket") and selected_bump.get("disaster_type"):
-                period_dt = pd.to_datetime(selected_bump["period_bucket"], errors="coerce")
-                if selected_bump.get("binning") == "months" and pd.notna(period_dt):
-                    period_label = period_dt.strftime("%b %Y")
-                    period_start = dt.date(period_dt.year, period_dt.month, 1)
-                    if period_dt.month == 12:
-                        period_end = dt.date(period_dt.year + 1, 1, 1)
-                    else:
-                        period_end = dt.date(period_dt.year, period_dt.month + 1, 1)
-                elif selected_bump.get("binning") == "years" and pd.notna(period_dt):
-                    period_label = period_dt.strftime("%Y")
-                    period_start = dt.date(period_dt.year, 1, 1)
-                    period_end = dt.date(period_dt.year + 1, 1, 1)
-                elif pd.notna(period_dt):
-                    period_label = f"{period_dt.strftime('%Y')}s"
-                    period_start = dt.date(period_dt.year, 1, 1)
-                    period_end = dt.date(period_dt.year + 10, 1, 1)
-                else:
-                    period_label = str(selected_bump["period_bucket"])
-                    period_start = dt.date(2000, 1, 1)
-                    period_end = dt.date(2001, 1, 1)
+                period_label = bump_period_label(
+                    selected_bump["period_bucket"], selected_bump.get("binning", "decades")
+                )
                 st.subheader(
                     f"Drilldown: {selected_bump['disaster_type']} in {period_label}"
                 )
@@ -1149,15 +1123,14 @@ with tabs[2]:
                     st.info("No drilldown data returned.")
                 else:
                     st.dataframe(_format_year_columns(drilldown_summary.df), use_container_width=True)
-                    top_states = (
-                        drilldown_summary.df[["state", "disaster_count"]]
-                        .dropna(subset=["state"])
-                        .head(5)
-                        .itertuples(index=False, name=None)
+                    narrative_inputs = bump_narrative_inputs(
+                        selected_bump.get("binning", "decades"),
+                        selected_bump["period_bucket"],
+                        selected_bump["disaster_type"],
+                        drilldown_summary.df,
                     )
-                    decade_label = period_label
                     cache = st.session_state.setdefault("bump_llm_cache", {})
-                    cache_key = f"{decade_label}|{selected_bump['disaster_type']}"
+                    cache_key = f"{period_label}|{selected_bump['disaster_type']}"
                     show_modal = st.session_state.get("show_bump_llm_modal")
                     if show_modal:
                         @st.dialog("LLM Summary")
@@ -1165,14 +1138,11 @@ with tabs[2]:
                             if cache_key in cache:
                                 st.write(cache[cache_key])
                             else:
+                                # Precomputed narratives are served as-is; only uncached
+                                # cells wait on OpenAI.
                                 with st.spinner("Summarizing with OpenAI..."):
                                     try:
-                                        summary = summarize_bump_entry(
-                                            decade_label=decade_label,
-                                            disaster_type=selected_bump["disaster_type"],
-                                            top_states=top_states,
-                                            binning=selected_bump.get("binning", "decades"),
-                                        )
+                                        summary = get_bump_narrative(narrative_inputs)
                                         cache[cache_key] = summary
                                         st.write(summary)
                                     except Exception as exc:
@@ -1297,19 +1267,21 @@ with tabs[4]:
         if focus_year:
             effective_years = (int(focus_year), int(focus_year))
         sunburst_start_preview, sunburst_end_preview = _year_range_to_dates(effective_years)
-        type_count_result = get_sunburst_rows(
+        # One all-types fetch per year range feeds both the checkbox counts and the
+        # sunburst itself; type selection is applied locally.
+        sunburst_all_df = get_sunburst_rows(
             sunburst_start_preview.isoformat(),
             sunburst_end_preview.isoformat(),
             None,
-        )
+        ).df
         type_counts = {}
-        if not type_count_result.df.empty:
-            count_df = type_count_result.df.copy()
-            count_df["county_count"] = pd.to_numeric(
-                count_df.get("county_count"), errors="coerce"
-            ).fillna(0)
+        if not sunburst_all_df.empty:
             type_counts = (
-                count_df.groupby("disaster_type")["county_count"].sum().to_dict()
+                pd.to_numeric(sunburst_all_df["county_count"], errors="coerce")
+                .fillna(0)
+                .groupby(sunburst_all_df["disaster_type"])
+                .sum()
+                .to_dict()
             )
         for dtype in type_options:
             key = f"filters_sunburst_type_{dtype}"
@@ -1355,142 +1327,59 @@ with tabs[4]:
         sunburst_start, sunburst_end = _year_range_to_dates(sunburst_years)
         if no_sunburst_selection:
             st.info("No data selected. Choose one or more disaster types to view results.")
-            sunburst_result = None
+            sunburst_df = None
+        elif sunburst_all_df.empty:
+            sunburst_df = sunburst_all_df
         else:
-            sunburst_result = get_sunburst_rows(
-                sunburst_start.isoformat(),
-                sunburst_end.isoformat(),
-                sunburst_types,
-            )
-        render_sunburst = sunburst_result is not None and not sunburst_result.df.empty
-        if sunburst_result is None or sunburst_result.df.empty:
+            sunburst_df = sunburst_all_df[sunburst_all_df["disaster_type"].isin(sunburst_types)]
+        render_sunburst = sunburst_df is not None and not sunburst_df.empty
+        if sunburst_df is None or sunburst_df.empty:
             st.info("No named event data available for the selected filters.")
         else:
-            df = sunburst_result.df.copy()
+            df = sunburst_df.copy()
             df["period_bucket"] = pd.to_datetime(df["period_bucket"])
             df["year"] = df["period_bucket"].dt.year.astype(int).astype(str)
             df["county_count"] = pd.to_numeric(df.get("county_count"), errors="coerce").fillna(0)
             names = df["declaration_name"].fillna("").astype(str).str.strip()
             unique_names = sorted({name for name in names.tolist() if name})
-            hash_input = "|".join(unique_names).encode("utf-8")
-            cache_key = f"sunburst_name_map_{hashlib.md5(hash_input).hexdigest()}"
             name_map = st.session_state.get("sunburst_name_map_global", {})
             missing_names = [name for name in unique_names if name not in name_map]
+            if missing_names:
+                # Durable groupings from earlier sessions first; only unseen names go to
+                # the LLM, and their labels are written back for the next session.
+                grouping_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+                stored_df = get_declaration_name_groupings(missing_names, grouping_model).df
+                if not stored_df.empty:
+                    name_map.update(
+                        zip(stored_df["declaration_name"], stored_df["grouped_label"])
+                    )
+                missing_names = [name for name in missing_names if name not in name_map]
             if missing_names:
                 with st.spinner("Grouping named events..."):
                     try:
-                        name_map.update(group_declaration_names(missing_names))
+                        grouped = group_declaration_names(missing_names)
+                        # Names the LLM leaves out keep their own label so they are
+                        # stored too and never sent again.
+                        grouped_names = {name: grouped.get(name, name) for name in missing_names}
+                        name_map.update(grouped_names)
                     except Exception as exc:
+                        grouped_names = {}
                         st.error(f"LLM grouping failed: {exc}")
-                st.session_state["sunburst_name_map_global"] = name_map
+                try:
+                    upsert_declaration_name_groupings(grouped_names, grouping_model)
+                except Exception as exc:
+                    # The session map still holds the labels if the table is missing.
+                    if not is_missing_object_error(exc):
+                        st.warning(f"Saving event name groupings failed: {exc}")
+            st.session_state["sunburst_name_map_global"] = name_map
             df["event"] = names.apply(
                 lambda value: name_map.get(value, value) if value else "Other/Unnamed"
             )
             df.loc[df["event"].eq(""), "event"] = "Other/Unnamed"
             df["state"] = df["state"].fillna("Unknown")
-            @st.cache_data(show_spinner=False)
-            def _build_sunburst_nodes(
-                input_df: pd.DataFrame, year_color_items: tuple[tuple[str, str], ...]
-            ) -> pd.DataFrame:
-                sunburst_df = (
-                    input_df.groupby(["disaster_type", "year", "event", "state"])["county_count"]
-                    .sum()
-                    .reset_index(name="value")
-                )
-                nodes = []
-                palette = px.colors.qualitative.Safe + px.colors.qualitative.Plotly
-                nodes.append(
-                    {
-                        "id": "root",
-                        "label": "Named Events",
-                        "parent": "",
-                        "value": int(sunburst_df["value"].sum()),
-                        "customdata": {"node_type": "root"},
-                        "color": "#ffffff",
-                    }
-                )
-
-                category_totals = (
-                    sunburst_df.groupby("disaster_type")["value"].sum().reset_index()
-                )
-                year_totals = (
-                    sunburst_df.groupby(["disaster_type", "year"])["value"]
-                    .sum()
-                    .reset_index()
-                )
-                year_colors = dict(year_color_items)
-                for row in category_totals.itertuples(index=False):
-                    nodes.append(
-                        {
-                            "id": f"category:{row.disaster_type}",
-                            "label": row.disaster_type,
-                            "parent": "root",
-                            "value": int(row.value),
-                            "customdata": {"node_type": "category", "category": row.disaster_type},
-                            "color": "#dddddd",
-                        }
-                    )
-                for row in year_totals.itertuples(index=False):
-                    nodes.append(
-                        {
-                            "id": f"category:{row.disaster_type}|year:{row.year}",
-                            "label": str(row.year),
-                            "parent": f"category:{row.disaster_type}",
-                            "value": int(row.value),
-                            "customdata": {
-                                "node_type": "year",
-                                "year": str(row.year),
-                                "category": row.disaster_type,
-                            },
-                            "color": year_colors.get(row.year, "#cccccc"),
-                        }
-                    )
-
-                year_event = (
-                    sunburst_df.groupby(["disaster_type", "year", "event"])["value"]
-                    .sum()
-                    .reset_index()
-                )
-                for row in year_event.itertuples(index=False):
-                    nodes.append(
-                        {
-                            "id": f"category:{row.disaster_type}|year:{row.year}|event:{row.event}",
-                            "label": row.event,
-                            "parent": f"category:{row.disaster_type}|year:{row.year}",
-                            "value": int(row.value),
-                            "customdata": {
-                                "node_type": "event",
-                                "year": str(row.year),
-                                "event": row.event,
-                                "category": row.disaster_type,
-                            },
-                            "color": year_colors.get(row.year, "#cccccc"),
-                        }
-                    )
-
-                for row in sunburst_df.itertuples(index=False):
-                    nodes.append(
-                        {
-                            "id": (
-                                f"category:{row.disaster_type}|year:{row.year}|"
-                                f"event:{row.event}|state:{row.state}"
-                            ),
-                            "label": row.state,
-                            "parent": f"category:{row.disaster_type}|year:{row.year}|event:{row.event}",
-                            "value": int(row.value),
-                            "customdata": {
-                                "node_type": "state",
-                                "year": str(row.year),
-                                "event": row.event,
-                                "state": row.state,
-                                "category": row.disaster_type,
-                            },
-                            "color": year_colors.get(row.year, "#cccccc"),
-                        }
-                    )
-
-                return pd.DataFrame(nodes)
-
+            name_map_version = hashlib.md5(
+                "|".join(f"{name}={name_map.get(name, name)}" for name in unique_names).encode("utf-8")
+            ).hexdigest()
             year_list = (
                 df["year"].astype(str).dropna().unique().tolist()
                 if "year" in df.columns
@@ -1508,7 +1397,14 @@ with tabs[4]:
             st.session_state["sunburst_year_color_index"] = year_color_index
             year_color_items = tuple((year, year_color_map[year]) for year in unique_years)
         if render_sunburst:
-                nodes_df = _build_sunburst_nodes(df, year_color_items)
+                nodes_df, sunburst_tree = _cached_sunburst_nodes(
+                    sunburst_start.isoformat(),
+                    sunburst_end.isoformat(),
+                    tuple(sunburst_types) if sunburst_types else None,
+                    name_map_version,
+                    year_color_items,
+                    df,
+                )
                 st.session_state["sunburst_nodes_df"] = nodes_df
                 selected_node = st.session_state.get("sunburst_selected_node")
                 breadcrumb_parts = ["Named Events"]
@@ -1545,46 +1441,7 @@ with tabs[4]:
                 focus_on_selection = bool(selected_id)
         
                 if selected_id and focus_on_selection:
-                    filtered_nodes = nodes_df[
-                        (nodes_df["id"] == selected_id)
-                        | (nodes_df["id"].str.startswith(f"{selected_id}|"))
-                    ]
-                    filtered_nodes = filtered_nodes.copy()
-                    subtree_ids = set(filtered_nodes["id"].tolist())
-                    filtered_nodes["parent"] = filtered_nodes["parent"].apply(
-                        lambda parent: parent if parent in subtree_ids else ""
-                    )
-                if focus_on_selection and len(filtered_nodes) < len(nodes_df):
-                    nodes_map = {
-                        row["id"]: {
-                            "id": row["id"],
-                            "parent": row["parent"],
-                            "value": row["value"],
-                        }
-                        for row in filtered_nodes.to_dict(orient="records")
-                    }
-                    children_map: dict[str, list[str]] = {}
-                    for node_id, node in nodes_map.items():
-                        parent_id = node["parent"]
-                        if parent_id:
-                            children_map.setdefault(parent_id, []).append(node_id)
-        
-                    def _sum_node(node_id: str) -> int:
-                        children = children_map.get(node_id)
-                        if not children:
-                            return int(nodes_map[node_id]["value"])
-                        total = 0
-                        for child_id in children:
-                            total += _sum_node(child_id)
-                        nodes_map[node_id]["value"] = total
-                        return total
-        
-                    for node_id in list(nodes_map.keys()):
-                        _sum_node(node_id)
-                    filtered_nodes = filtered_nodes.copy()
-                    filtered_nodes["value"] = filtered_nodes["id"].map(
-                        lambda value: nodes_map.get(value, {}).get("value", 0)
-                    )
+                    filtered_nodes = sunburst_tree.subtree(nodes_df, selected_id)
                 st.session_state["sunburst_filtered_nodes_df"] = filtered_nodes
                 sunburst_col, narrative_col = st.columns([3, 2], gap="large")
                 with sunburst_col:
@@ -1615,7 +1472,8 @@ with tabs[4]:
                             if isinstance(filtered_df, pd.DataFrame):
                                 idx = int(event["pointNumber"])
                                 if 0 <= idx < len(filtered_df):
-                                    cd = filtered_df.iloc[idx]["customdata"]
+                                    cd = filtered_df.iloc[idx][SUNBURST_CUSTOMDATA_COLUMNS].tolist()
+                        cd = sunburst_node_selection(cd)
                         if isinstance(cd, dict):
                             selected_category = cd.get("category")
                             selected_year = cd.get("year")
@@ -1638,6 +1496,7 @@ with tabs[4]:
                                 chart_container.empty()
                                 st.rerun()
                                 # No forced rerun; let Streamlit update naturally.
+                    _prefetch_impact_summaries(df, filtered_nodes)
         
                 with narrative_col:
                     st.subheader("Impact Assessment")
@@ -1654,75 +1513,19 @@ with tabs[4]:
                     @st.dialog("Impact Assessment")
                     def _show_impact_assessment():
                         cache = st.session_state.setdefault("sunburst_summary_cache", {})
-                        node_type = selected_node.get("node_type")
-                        year_str = selected_node.get("year")
-                        year_int = int(year_str) if year_str and str(year_str).isdigit() else None
-                        event_name = selected_node.get("event")
-                        state = selected_node.get("state")
-        
-                        if node_type == "year" and year_int is not None:
-                            cache_key = f"sunburst:year:{year_int}"
-                            if cache_key not in cache:
-                                year_df = df[df["year"] == str(year_int)]
-                                top_types = year_df["disaster_type"].value_counts().head(8).items()
-                                top_events = (
-                                    year_df[year_df["event"] != "Other/Unnamed"]["event"]
-                                    .value_counts()
-                                    .head(8)
-                                    .items()
-                                )
-                                with st.spinner("Summarizing year events..."):
-                                    cache[cache_key] = summarize_year_events(
-                                        year_int,
-                                        top_types,
-                                        top_events,
-                                    )
-                            st.write(cache[cache_key])
-        
-                        elif node_type == "event" and year_int is not None:
-                            if event_name == "Other/Unnamed":
-                                cache_key = f"sunburst:unnamed:{year_int}"
-                                if cache_key not in cache:
-                                    unnamed_df = df[(df["year"] == str(year_int)) & (df["event"] == "Other/Unnamed")]
-                                    top_types = unnamed_df["disaster_type"].value_counts().head(8).items()
-                                    with st.spinner("Summarizing unnamed events..."):
-                                        cache[cache_key] = summarize_unnamed_events(year_int, top_types)
-                                st.write(cache[cache_key])
-                            else:
-                                cache_key = f"sunburst:event:{year_int}:{event_name}"
-                                if cache_key not in cache:
-                                    event_df = df[(df["year"] == str(year_int)) & (df["event"] == event_name)]
-                                    top_states = event_df["state"].value_counts().head(8).items()
-                                    with st.spinner("Summarizing named event..."):
-                                        cache[cache_key] = summarize_named_event(
-                                            event_name,
-                                            year_int,
-                                            top_states,
-                                        )
-                                st.write(cache[cache_key])
-        
-                        elif node_type == "state" and year_int is not None and event_name:
-                            if event_name == "Other/Unnamed":
-                                cache_key = f"sunburst:unnamed:{year_int}"
-                                if cache_key not in cache:
-                                    unnamed_df = df[(df["year"] == str(year_int)) & (df["event"] == "Other/Unnamed")]
-                                    top_types = unnamed_df["disaster_type"].value_counts().head(8).items()
-                                    with st.spinner("Summarizing unnamed events..."):
-                                        cache[cache_key] = summarize_unnamed_events(year_int, top_types)
-                                st.write(cache[cache_key])
-                            else:
-                                cache_key = f"sunburst:state:{year_int}:{event_name}:{state}"
-                                if cache_key not in cache:
-                                    with st.spinner("Summarizing event in state..."):
-                                        cache[cache_key] = summarize_event_state(
-                                            event_name,
-                                            state,
-                                            year_int,
-                                        )
-                                st.write(cache[cache_key])
-                        else:
+                        request = _impact_summary_request(df, selected_node)
+                        if request is None:
                             st.caption("Select a year or named event to see a summary.")
-        
+                            return
+                        cache_key, spinner_text, summarize, args = request
+                        if cache_key not in cache:
+                            summary = get_cached_summary(cache_key)
+                            if summary is None:
+                                with st.spinner(spinner_text):
+                                    summary = get_summary_prefetched(cache_key, summarize, *args)
+                            cache[cache_key] = summary
+                        st.write(cache[cache_key])
+
                     _show_impact_assessment()
                     st.session_state["sunburst_show_modal"] = False
         
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Weeks start on Monday, matching queries._monday_week_expr; 1970-01-01 was a Thursday.
+_EPOCH_WEEKDAY_OFFSET = 3
+
+
+@dataclass
+class CountCube:
+    # Sparse state x disaster_type x day counts stored as COO triplets sorted by day,
+    # so any date range is a contiguous slice found with searchsorted.
+    states: pd.Index
+    types: pd.Index
+    days: np.ndarray
+    state_idx: np.ndarray
+    type_idx: np.ndarray
+    counts: np.ndarray
+    refresh_token: str = ""
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, refresh_token: str = "") -> "CountCube":
+        days = pd.to_datetime(df["period_day"], errors="coerce").to_numpy(dtype="datetime64[D]")
+        order = np.argsort(days, kind="stable")
+        state_idx, states = pd.factorize(df["state"], use_na_sentinel=False)
+        type_idx, types = pd.factorize(df["disaster_type"], use_na_sentinel=False)
+        counts = pd.to_numeric(df["disaster_count"], errors="coerce").fillna(0).to_numpy()
+        return cls(
+            states=pd.Index(states),
+            types=pd.Index(types),
+            days=days[order],
+            state_idx=state_idx[order].astype(np.int32),
+            type_idx=type_idx[order].astype(np.int32),
+            counts=counts[order].astype(np.int64),
+            refresh_token=refresh_token,
+        )
+
+    def _slice(
+        self,
+        start_date: str,
+        end_date: str,
+        disaster_types: Optional[list[str]],
+    ) -> tuple[slice, Optional[np.ndarray]]:
+        lo = np.searchsorted(self.days, np.datetime64(start_date, "D"), side="left")
+        hi = np.searchsorted(self.days, np.datetime64(end_date, "D"), side="left")
+        window = slice(lo, hi)
+        if not disaster_types:
+            return window, None
+        wanted = self.types.get_indexer(pd.Index(disaster_types))
+        return window, np.isin(self.type_idx[window], wanted[wanted >= 0])
+
+    def state_totals(
+        self,
+        start_date: str,
+        end_date: str,
+        disaster_types: Optional[list[str]] = None,
+    ) -> pd.DataFrame:
+        window, type_mask = self._slice(start_date, end_date, disaster_types)
+        state_idx = self.state_idx[window]
+        counts = self.counts[window]
+        if type_mask is not None:
+            state_idx = state_idx[type_mask]
+            counts = counts[type_mask]
+        totals = np.bincount(state_idx, weights=counts, minlength=len(self.states))
+        present = np.flatnonzero(np.bincount(state_idx, minlength=len(self.states)))
+        return pd.DataFrame(
+            {
+                "state": self.states[present],
+                "disaster_count": totals[present].astype(np.int64),
+            }
+        )
+
+    def state_summary(
+        self,
+        state: str,
+        start_date: str,
+        end_date: str,
+        grain: str,
+        disaster_types: Optional[list[str]] = None,
+    ) -> pd.DataFrame:
+        columns = ["disaster_type", "period_bucket", "disaster_count"]
+        if state not in self.states:
+            return pd.DataFrame(columns=columns)
+        window, type_mask = self._slice(start_date, end_date, disaster_types)
+        mask = self.state_idx[window] == self.states.get_loc(state)
+        if type_mask is not None:
+            mask &= type_mask
+        days = self.days[window][mask]
+        type_idx = self.type_idx[window][mask]
+        counts = self.counts[window][mask]
+        if grain == "year":
+            buckets = days.astype("datetime64[Y]").astype("datetime64[D]")
+        elif grain == "month":
+            buckets = days.astype("datetime64[M]").astype("datetime64[D]")
+        else:
+            day_numbers = days.astype(np.int64)
+            buckets = (day_numbers - (day_numbers + _EPOCH_WEEKDAY_OFFSET) % 7).astype(
+                "datetime64[D]"
+            )
+        if not len(days):
+            return pd.DataFrame(columns=columns)
+        bucket_numbers = buckets.astype(np.int64)
+        base = bucket_numbers.min()
+        span = bucket_numbers.max() - base + 1
+        keys = type_idx.astype(np.int64) * span + (bucket_numbers - base)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=counts, minlength=len(unique_keys))
+        return pd.DataFrame(
+            {
+                "disaster_type": self.types[unique_keys // span],
+                "period_bucket": pd.to_datetime((unique_keys % span + base).astype("datetime64[D]")),
+                "disaster_count": totals.astype(np.int64),
+            },
+            columns=columns,
+        )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+
+GENERIC_DECLARATION_NAMES = (
+    "severe storm",
+    "severe storms",
+    "severe weather",
+    "storm",
+    "storms",
+    "flood",
+    "flooding",
+    "wildfire",
+    "wildfires",
+    "snowstorm",
+    "snowstorms",
+    "winter storm",
+    "winter storms",
+    "tornado",
+    "tornadoes",
+    "hurricane",
+    "tropical storm",
+    "earthquake",
+    "volcanic eruption",
+    "volcano",
+    "drought",
+    "fire",
+)
+_GENERIC_NAME_PATTERN = re.compile(
+    "|".join(re.escape(name) for name in sorted(GENERIC_DECLARATION_NAMES, key=len, reverse=True))
+)
+
+
+def _iso_dates(values: pd.Series) -> pd.Series:
+    # Declarations share a small set of dates, so format each distinct date once.
+    codes, uniques = pd.factorize(values)
+    text = np.asarray(pd.DatetimeIndex(uniques).strftime("%Y-%m-%d"), dtype=object)
+    return pd.Series(
+        np.where(codes >= 0, text[codes] if len(text) else None, None),
+        index=values.index,
+        dtype=object,
+    )
+
+
+def format_date_ranges(
+    start: pd.Series,
+    end: pd.Series,
+    fallback_start: pd.Series,
+    fallback_end: pd.Series | None = None,
+    empty_text: str = "",
+) -> pd.Series:
+    if fallback_end is None:
+        fallback_end = fallback_start
+    no_range = start.isna() & end.isna()
+    start = start.mask(no_range, fallback_start)
+    end = end.mask(no_range, fallback_end)
+    start_text = _iso_dates(start)
+    end_text = _iso_dates(end)
+    start_text = start_text.fillna(end_text)
+    single_day = start.isna() | end.isna() | (start == end)
+    text = np.where(
+        start_text.isna(),
+        empty_text,
+        np.where(single_day, start_text, start_text + " to " + end_text),
+    )
+    return pd.Series(text, index=start.index, dtype=object)
+
+
+def is_generic_name(names: pd.Series, disaster_types: pd.Series) -> pd.Series:
+    # A name is generic when it is a stock phrase ("Severe Storms"), just the disaster
+    # type, or the type plus at most one more word ("Flooding Event").
+    cleaned = names.fillna("").astype(str).str.strip().str.lower()
+    type_clean = disaster_types.fillna("").astype(str).str.strip().str.lower()
+    stock_phrase = cleaned.str.fullmatch(_GENERIC_NAME_PATTERN)
+    has_type = type_clean.ne("")
+    type_prefix = np.char.startswith(
+        cleaned.to_numpy(dtype=str), type_clean.to_numpy(dtype=str)
+    )
+    short = cleaned.str.count(r"\S+").le(2)
+    return stock_phrase | (has_type & (cleaned.eq(type_clean) | (type_prefix & short)))
+
+
+def drilldown_display_names(df: pd.DataFrame) -> pd.Series:
+    names = df["declaration_name"]
+    date_ranges = format_date_ranges(
+        df["disaster_begin_date"],
+        df["disaster_end_date"],
+        df["disaster_declaration_date"],
+    )
+    generic = is_generic_name(names, df["disaster_type"])
+    decorated = (names + " (" + date_ranges + ")").str.replace(" ()", "", regex=False)
+    return names.where(~generic, decorated)
+
+
+def name_date_ranges(df: pd.DataFrame, name_column: str = "display_name") -> dict[str, str]:
+    ranges = df.groupby(name_column, dropna=False).agg(
+        start_min=("disaster_begin_date", "min"),
+        end_max=("disaster_end_date", "max"),
+        decl_min=("disaster_declaration_date", "min"),
+    )
+    text = format_date_ranges(ranges["start_min"], ranges["end_max"], ranges["decl_min"])
+    return dict(zip(ranges.index, text))
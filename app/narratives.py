@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+import pandas as pd
+
+from llm import summarize_bump_entry
+from queries import get_bump_narratives, is_missing_object_error, upsert_bump_narratives
+from trends import bump_period_label
+
+BUMP_NARRATIVE_TOP_STATES = 5
+
+
+def bump_narrative_model() -> str:
+    return os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+
+def bump_narrative_inputs(
+    binning: str,
+    period_bucket: str,
+    disaster_type: str,
+    state_summary: pd.DataFrame,
+) -> dict[str, Any]:
+    top_states = (
+        state_summary[["state", "disaster_count"]]
+        .dropna(subset=["state"])
+        .head(BUMP_NARRATIVE_TOP_STATES)
+    )
+    return {
+        "binning": binning,
+        "period_bucket": pd.Timestamp(period_bucket).date().isoformat(),
+        "period_label": bump_period_label(period_bucket, binning),
+        "disaster_type": disaster_type,
+        "top_states": [
+            [str(state), int(count)]
+            for state, count in zip(top_states["state"], top_states["disaster_count"])
+        ],
+    }
+
+
+def bump_narrative_hash(inputs: dict[str, Any]) -> str:
+    # Only fields that reach the prompt are hashed, so new counts produce a new key.
+    prompt_inputs = {
+        key: inputs[key] for key in ("binning", "period_label", "disaster_type", "top_states")
+    }
+    payload = json.dumps(prompt_inputs, sort_keys=True, ensure_ascii=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def generate_bump_narrative(inputs: dict[str, Any], llm_model: Optional[str] = None) -> dict:
+    narrative = summarize_bump_entry(
+        decade_label=inputs["period_label"],
+        disaster_type=inputs["disaster_type"],
+        top_states=[tuple(item) for item in inputs["top_states"]],
+        binning=inputs["binning"],
+    )
+    return {
+        "inputs_hash": bump_narrative_hash(inputs),
+        "llm_model": llm_model or bump_narrative_model(),
+        "binning": inputs["binning"],
+        "period_bucket": inputs["period_bucket"],
+        "disaster_type": inputs["disaster_type"],
+        "narrative": narrative,
+    }
+
+
+def get_stored_bump_narratives(inputs_hashes: list[str], llm_model: Optional[str] = None) -> dict:
+    df = get_bump_narratives(inputs_hashes, llm_model or bump_narrative_model()).df
+    if df.empty:
+        return {}
+    return dict(zip(df["inputs_hash"], df["narrative"]))
+
+
+def get_bump_narrative(inputs: dict[str, Any], generate: bool = True) -> Optional[str]:
+    llm_model = bump_narrative_model()
+    inputs_hash = bump_narrative_hash(inputs)
+    stored = get_stored_bump_narratives([inputs_hash], llm_model).get(inputs_hash)
+    if stored or not generate:
+        return stored
+    row = generate_bump_narrative(inputs, llm_model)
+    try:
+        upsert_bump_narratives([row])
+    except Exception as exc:
+        # A missing narrative table should not hide a summary we already paid for.
+        if not is_missing_object_error(exc):
+            raise
+    return row["narrative"]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+from queries import (
+    DRILLDOWN_ROW_LIMIT,
+    QueryResult,
+    get_drilldown,
+    get_drilldown_aggregated,
+    get_drilldown_row_count,
+    is_drilldown_cached,
+    refresh_sankey_flows,
+)
+
+DRILLDOWN_PREFETCH_TOP_N = 5
+PREFETCH_MAX_WORKERS = 3
+NARRATIVE_PREFETCH_MAX_WORKERS = 2
+SUMMARY_CACHE_MAX_ENTRIES = 512
+
+# Shared by every session in the process so concurrent users cannot fan out into
+# an unbounded number of warehouse queries.
+_executor = ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="prefetch")
+# LLM narratives get their own, smaller pool so slow completions never hold up
+# drilldown queries.
+_narrative_executor = ThreadPoolExecutor(
+    max_workers=NARRATIVE_PREFETCH_MAX_WORKERS, thread_name_prefix="narrative-prefetch"
+)
+_in_flight: dict[tuple, Future] = {}
+_in_flight_lock = threading.Lock()
+_summary_cache: OrderedDict[str, str] = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def fetch_drilldown(
+    state: str,
+    disaster_type: str,
+    period_bucket: str,
+    grain: str,
+    row_estimate: Optional[int] = None,
+) -> tuple[QueryResult, bool, int]:
+    # The cube cell count is an upper bound on drilldown rows; only query for an exact
+    # count when the caller does not have one.
+    if row_estimate is None:
+        count_df = get_drilldown_row_count(state, disaster_type, period_bucket, grain).df
+        row_estimate = int(count_df["row_count"].iloc[0]) if not count_df.empty else 0
+    row_estimate = int(row_estimate)
+    aggregated = row_estimate > DRILLDOWN_ROW_LIMIT
+    fetch = get_drilldown_aggregated if aggregated else get_drilldown
+    return fetch(state, disaster_type, period_bucket, grain), aggregated, row_estimate
+
+
+def _drilldown_key(state: str, disaster_type: str, period_bucket: str, grain: str) -> tuple:
+    return ("drilldown", state, disaster_type, pd.Timestamp(period_bucket).date(), grain)
+
+
+def get_drilldown_prefetched(
+    state: str,
+    disaster_type: str,
+    period_bucket: str,
+    grain: str,
+    row_estimate: Optional[int] = None,
+) -> tuple[QueryResult, bool, int]:
+    # Join a prefetch that is still running instead of issuing the same query twice.
+    with _in_flight_lock:
+        future = _in_flight.get(_drilldown_key(state, disaster_type, period_bucket, grain))
+    if future is not None:
+        try:
+            return future.result()
+        except Exception:
+            pass
+    return fetch_drilldown(state, disaster_type, period_bucket, grain, row_estimate)
+
+
+def _submit_once(key: tuple, fn, *args, executor: Optional[ThreadPoolExecutor] = None) -> Future:
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is not None and not future.done():
+            return future
+        future = (executor or _executor).submit(fn, *args)
+        _in_flight[key] = future
+    future.add_done_callback(lambda _: _discard(key, future))
+    return future
+
+
+def _discard(key: tuple, future: Future) -> None:
+    with _in_flight_lock:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+
+
+def prefetch_drilldowns(
+    state: str,
+    cube_df: pd.DataFrame,
+    grain: str,
+    top_n: int = DRILLDOWN_PREFETCH_TOP_N,
+) -> list[Future]:
+    if cube_df.empty or top_n <= 0:
+        return []
+    futures = []
+    hottest = cube_df.nlargest(top_n, "disaster_count")
+    for disaster_type, period_bucket, disaster_count in zip(
+        hottest["disaster_type"], hottest["period_bucket"], hottest["disaster_count"]
+    ):
+        row_estimate = int(disaster_count)
+        aggregated = row_estimate > DRILLDOWN_ROW_LIMIT
+        if is_drilldown_cached(state, disaster_type, period_bucket, grain, aggregated):
+            continue
+        key = _drilldown_key(state, disaster_type, period_bucket, grain)
+        futures.append(
+            _submit_once(
+                key,
+                fetch_drilldown,
+                state,
+                disaster_type,
+                period_bucket,
+                grain,
+                row_estimate,
+            )
+        )
+    return futures
+
+
+def get_cached_summary(key: str) -> Optional[str]:
+    with _summary_cache_lock:
+        summary = _summary_cache.get(key)
+        if summary is not None:
+            _summary_cache.move_to_end(key)
+        return summary
+
+
+def _generate_summary(key: str, fn: Callable[..., str], *args: Any) -> str:
+    summary = fn(*args)
+    with _summary_cache_lock:
+        _summary_cache[key] = summary
+        _summary_cache.move_to_end(key)
+        while len(_summary_cache) > SUMMARY_CACHE_MAX_ENTRIES:
+            _summary_cache.popitem(last=False)
+    return summary
+
+
+def get_summary_prefetched(key: str, fn: Callable[..., str], *args: Any) -> str:
+    summary = get_cached_summary(key)
+    if summary is not None:
+        return summary
+    with _in_flight_lock:
+        future = _in_flight.get(("summary", key))
+    if future is not None:
+        try:
+            return future.result()
+        except Exception:
+            pass
+    return _generate_summary(key, fn, *args)
+
+
+def prefetch_summaries(requests: list[tuple[str, Callable[..., str], tuple]]) -> list[Future]:
+    futures = []
+    for key, fn, args in requests:
+        if get_cached_summary(key) is not None:
+            continue
+        futures.append(
+            _submit_once(("summary", key), _generate_summary, key, fn, *args, executor=_narrative_executor)
+        )
+    return futures
+
+
+def refresh_sankey_flows_in_background(year: int) -> Future:
+    # The stored procedure rewrites a whole year of flows; run it off the render thread.
+    return _submit_once(("sankey_flows", int(year)), refresh_sankey_flows, int(year))
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
@@ -39,6 +44,53 @@ def fetch_df(sql: str, params: Optional[Dict[str, Any]] = None) -> QueryResult:
         conn.close()
 
 
+def is_missing_object_error(exc: Exception) -> bool:
+    # Snowflake 002003: "Object ... does not exist or not authorized", i.e. an optional
+    # table or view from a later pipeline step has not been deployed.
+    message = str(exc)
+    return "002003" in message or "does not exist or not authorized" in message
+
+
+RESULT_CACHE_TTL_S = 900
+RESULT_CACHE_MAX_ENTRIES = 256
+_result_cache: OrderedDict[str, tuple[float, QueryResult]] = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _result_cache_key(sql: str, params: Dict[str, Any]) -> str:
+    return json.dumps([sql, params], sort_keys=True, default=str)
+
+
+def fetch_df_cached(
+    sql: str,
+    params: Optional[Dict[str, Any]] = None,
+    ttl_s: float = RESULT_CACHE_TTL_S,
+) -> QueryResult:
+    # Process-wide cache shared by Streamlit sessions and background prefetch threads.
+    params = params or {}
+    key = _result_cache_key(sql, params)
+    now = time.monotonic()
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is not None and entry[0] > now:
+            _result_cache.move_to_end(key)
+            return QueryResult(df=entry[1].df.copy(), sql=sql, params=params)
+    result = fetch_df(sql, params)
+    with _result_cache_lock:
+        _result_cache[key] = (now + ttl_s, result)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > RESULT_CACHE_MAX_ENTRIES:
+            _result_cache.popitem(last=False)
+    return QueryResult(df=result.df.copy(), sql=sql, params=params)
+
+
+def is_result_cached(sql: str, params: Optional[Dict[str, Any]] = None) -> bool:
+    key = _result_cache_key(sql, params or {})
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+
 def execute_sql(sql: str, params: Optional[Dict[str, Any]] = None) -> None:
     params = params or {}
     conn = get_connection()
@@ -155,6 +207,19 @@ def _in_clause(param_base: str, values: Optional[list[str]]) -> tuple[str, Dict[
     return clause, params
 
 
+# Cache keys for DISASTER_NAME_GROUPING_CACHE. Every query that returns or joins on
+# record_id/source_text_hash must use these expressions so the hashes stay identical.
+# They keep the warm script's Python normalization (stripped text, "Unknown" state,
+# str(None) type) so rows it wrote earlier still match.
+_SANKEY_RECORD_ID_SQL = (
+    "SHA2(CONCAT(COALESCE(disaster_type, 'None'), '|', "
+    "COALESCE(TRIM(declaration_name), ''), '|', COALESCE(TRIM(state), 'Unknown')), 256)"
+)
+_SANKEY_SOURCE_TEXT_HASH_SQL = (
+    "SHA2(CONCAT(COALESCE(disaster_type, 'None'), '|', COALESCE(TRIM(declaration_name), '')), 256)"
+)
+
+
 def get_distinct_disaster_types() -> QueryResult:
     sql = """
         SELECT DISTINCT disaster_type AS disaster_type
@@ -178,17 +243,14 @@ def get_disaster_date_bounds() -> QueryResult:
 
 
 
-def get_sankey_rows(
-    start_date: str,
-    end_date: str,
-    disaster_types: Optional[list[str]] = None,
-) -> QueryResult:
-    type_clause, type_params = _in_clause("dtype", disaster_types)
-    sql = """
+def _sankey_rows_sql(type_clause: str) -> str:
+    return """
         SELECT
           disaster_type AS disaster_type,
           declaration_name AS declaration_name,
           state AS state,
+          {record_id_expr} AS record_id,
+          {source_text_hash_expr} AS source_text_hash,
           COUNT(DISTINCT county_fips) AS county_count,
           MIN(disaster_declaration_date) AS disaster_declaration_date,
           MIN(disaster_begin_date) AS disaster_begin_date,
@@ -202,41 +264,128 @@ def get_sankey_rows(
           AND county_fips IS NOT NULL
           {type_clause}
         GROUP BY disaster_type, declaration_name, state
-    """.format(type_clause=type_clause)
+    """.format(
+        record_id_expr=_SANKEY_RECORD_ID_SQL,
+        source_text_hash_expr=_SANKEY_SOURCE_TEXT_HASH_SQL,
+        type_clause=type_clause,
+    )
+
+
+def get_sankey_rows(
+    start_date: str,
+    end_date: str,
+    disaster_types: Optional[list[str]] = None,
+) -> QueryResult:
+    type_clause, type_params = _in_clause("dtype", disaster_types)
+    return fetch_df(
+        _sankey_rows_sql(type_clause),
+        {"start_date": start_date, "end_date": end_date, **type_params},
+    )
+
+
+def get_sankey_rows_with_cache(
+    start_date: str,
+    end_date: str,
+    disaster_types: Optional[list[str]] = None,
+) -> QueryResult:
+    type_clause, type_params = _in_clause("dtype", disaster_types)
+    sql = """
+        WITH base AS (
+            {base_sql}
+        )
+        SELECT
+          base.*,
+          cache.source_text_hash AS cache_source_text_hash,
+          cache.name_group AS cache_name_group,
+          cache.theme_group AS cache_theme_group,
+          cache.theme_confidence AS cache_theme_confidence,
+          cache.is_named_event AS cache_is_named_event,
+          cache.canonical_event_name AS cache_canonical_event_name,
+          cache.confidence AS cache_confidence,
+          cache.llm_model AS cache_llm_model,
+          cache.updated_at AS cache_updated_at,
+          (
+            cache.record_id IS NULL
+            OR cache.source_text_hash IS DISTINCT FROM base.source_text_hash
+          ) AS needs_enrich
+        FROM base
+        LEFT JOIN ANALYTICS.MONITORING.DISASTER_NAME_GROUPING_CACHE AS cache
+          ON cache.record_id = base.record_id
+    """.format(base_sql=_sankey_rows_sql(type_clause))
     return fetch_df(
         sql,
         {"start_date": start_date, "end_date": end_date, **type_params},
     )
 
 
+def get_sankey_flows(year: int, disaster_types: Optional[list[str]] = None) -> QueryResult:
+    type_clause, type_params = _in_clause("dtype", disaster_types)
+    sql = f"""
+        SELECT
+          theme_group,
+          name_group,
+          event_name,
+          state,
+          SUM(county_count) AS county_count,
+          MIN(begin_date_min) AS begin_date_min,
+          MAX(end_date_max) AS end_date_max,
+          MIN(declaration_date_min) AS declaration_date_min,
+          MAX(declaration_date_max) AS declaration_date_max,
+          MAX(refreshed_at) AS refreshed_at
+        FROM ANALYTICS.GOLD.SANKEY_FLOWS
+        WHERE year = %(year)s
+          {type_clause}
+        GROUP BY theme_group, name_group, event_name, state
+    """
+    params = {"year": int(year), **type_params}
+    try:
+        return fetch_df(sql, params)
+    except Exception as exc:
+        if not is_missing_object_error(exc):
+            raise
+        # Flows table not deployed yet; callers fall back to building from Silver.
+        return QueryResult(df=pd.DataFrame(), sql=sql, params=params)
+
+
+def refresh_sankey_flows(year: Optional[int] = None) -> None:
+    execute_sql(
+        "CALL ANALYTICS.GOLD.SP_REFRESH_SANKEY_FLOWS(%(year)s)",
+        {"year": int(year) if year is not None else None},
+    )
+
+
+
+def _json_array_param(values: list[str]) -> str:
+    return json.dumps([str(value) for value in values], ensure_ascii=True)
 
 
 def get_name_grouping_cache(record_ids: list[str]) -> QueryResult:
     if not record_ids:
         return QueryResult(df=pd.DataFrame(), sql="", params={})
-    placeholders = []
-    params: Dict[str, Any] = {}
-    for idx, record_id in enumerate(record_ids):
-        key = f"rid{idx}"
-        placeholders.append(f"%({key})s")
-        params[key] = record_id
-    sql = f"""
+    # Ship the IDs as one JSON array bind and join against it; one placeholder per ID
+    # made the statement text (and Snowflake's parse time) grow with the ID count.
+    sql = """
+        WITH requested AS (
+            SELECT DISTINCT value::STRING AS record_id
+            FROM TABLE(FLATTEN(input => PARSE_JSON(%(record_ids)s)))
+        )
         SELECT
-          record_id AS record_id,
-          source_text_hash AS source_text_hash,
-          is_named_event AS is_named_event,
-          canonical_event_name AS canonical_event_name,
-          name_group AS name_group,
-          theme_group AS theme_group,
-          theme_confidence AS theme_confidence,
-          confidence AS confidence,
-          llm_model AS llm_model,
-          created_at AS created_at,
-          updated_at AS updated_at
-        FROM ANALYTICS.MONITORING.DISASTER_NAME_GROUPING_CACHE
-        WHERE record_id IN ({", ".join(placeholders)})
+          cache.record_id AS record_id,
+          cache.source_text_hash AS source_text_hash,
+          cache.is_named_event AS is_named_event,
+          cache.canonical_event_name AS canonical_event_name,
+          cache.name_group AS name_group,
+          cache.theme_group AS theme_group,
+          cache.theme_confidence AS theme_confidence,
+          cache.confidence AS confidence,
+          cache.llm_model AS llm_model,
+          cache.created_at AS created_at,
+          cache.updated_at AS updated_at
+        FROM ANALYTICS.MONITORING.DISASTER_NAME_GROUPING_CACHE AS cache
+        JOIN requested
+          ON requested.record_id = cache.record_id
     """
-    return fetch_df(sql, params)
+    return fetch_df(sql, {"record_ids": _json_array_param(record_ids)})
 
 
 
@@ -287,7 +436,7 @@ def upsert_name_grouping_cache(
                 FROM VALUES {", ".join(values_sql)}
             ) AS source
             ON target.record_id = source.record_id
-            WHEN MATCHED AND target.source_text_hash <> source.source_text_hash THEN
+            WHEN MATCHED AND target.source_text_hash IS DISTINCT FROM source.source_text_hash THEN
               UPDATE SET
                 source_text_hash = source.source_text_hash,
                 is_named_event = source.is_named_event,
@@ -329,6 +478,90 @@ def upsert_name_grouping_cache(
         execute_sql(sql, params)
 
 
+def _declaration_name_hash(name: str) -> str:
+    return hashlib.sha256(name.encode("utf-8")).hexdigest()
+
+
+def get_declaration_name_groupings(names: list[str], llm_model: str) -> QueryResult:
+    if not names:
+        return QueryResult(df=pd.DataFrame(), sql="", params={})
+    sql = """
+        WITH requested AS (
+            SELECT DISTINCT value::STRING AS name_hash
+            FROM TABLE(FLATTEN(input => PARSE_JSON(%(name_hashes)s)))
+        )
+        SELECT
+          cache.declaration_name AS declaration_name,
+          cache.grouped_label AS grouped_label
+        FROM ANALYTICS.MONITORING.DECLARATION_NAME_GROUPING_CACHE AS cache
+        JOIN requested
+          ON requested.name_hash = cache.name_hash
+        WHERE cache.llm_model = %(llm_model)s
+    """
+    params = {
+        "name_hashes": _json_array_param([_declaration_name_hash(name) for name in names]),
+        "llm_model": llm_model,
+    }
+    try:
+        return fetch_df(sql, params)
+    except Exception as exc:
+        if not is_missing_object_error(exc):
+            raise
+        # Grouping table not deployed yet; callers group every name with the LLM.
+        return QueryResult(df=pd.DataFrame(), sql=sql, params=params)
+
+
+def upsert_declaration_name_groupings(
+    mapping: dict[str, str],
+    llm_model: str,
+    batch_size: int = 1000,
+) -> None:
+    items = [(name, label) for name, label in mapping.items() if name]
+    for start in range(0, len(items), batch_size):
+        rows = [
+            {
+                "name_hash": _declaration_name_hash(name),
+                "declaration_name": name,
+                "grouped_label": label,
+            }
+            for name, label in items[start : start + batch_size]
+        ]
+        sql = """
+            MERGE INTO ANALYTICS.MONITORING.DECLARATION_NAME_GROUPING_CACHE AS target
+            USING (
+                SELECT
+                  value:name_hash::STRING AS name_hash,
+                  value:declaration_name::STRING AS declaration_name,
+                  value:grouped_label::STRING AS grouped_label
+                FROM TABLE(FLATTEN(input => PARSE_JSON(%(rows)s)))
+            ) AS source
+            ON target.name_hash = source.name_hash
+              AND target.llm_model = %(llm_model)s
+            WHEN MATCHED AND target.grouped_label IS DISTINCT FROM source.grouped_label THEN
+              UPDATE SET
+                grouped_label = source.grouped_label,
+                updated_at = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN
+              INSERT (
+                name_hash,
+                llm_model,
+                declaration_name,
+                grouped_label,
+                created_at,
+                updated_at
+              )
+              VALUES (
+                source.name_hash,
+                %(llm_model)s,
+                source.declaration_name,
+                source.grouped_label,
+                CURRENT_TIMESTAMP(),
+                CURRENT_TIMESTAMP()
+              )
+        """
+        execute_sql(sql, {"rows": json.dumps(rows, ensure_ascii=True), "llm_model": llm_model})
+
+
 def get_state_choropleth(
     start_date: str,
     end_date: str,
@@ -351,6 +584,43 @@ def get_state_choropleth(
     return fetch_df(sql, params)
 
 
+def get_county_choropleth(
+    start_date: str,
+    end_date: str,
+    disaster_types: Optional[list[str]] = None,
+    state: Optional[str] = None,
+) -> QueryResult:
+    type_clause, type_params = _in_clause("dtype", disaster_types)
+    params: Dict[str, Any] = {"start_date": start_date, "end_date": end_date, **type_params}
+    state_clause = ""
+    if state:
+        state_clause = "AND state = %(state)s"
+        params["state"] = state
+    sql = """
+        SELECT
+          county_fips AS county_fips,
+          MAX(state) AS state,
+          MAX(county_name) AS county_name,
+          COUNT(*) AS disaster_count
+        FROM ANALYTICS.SILVER.FCT_DISASTERS
+        WHERE COALESCE(disaster_declaration_date, disaster_begin_date, disaster_end_date)
+          >= %(start_date)s
+          AND COALESCE(disaster_declaration_date, disaster_begin_date, disaster_end_date)
+          < %(end_date)s
+          AND county_fips IS NOT NULL
+          {type_clause}
+          {state_clause}
+        GROUP BY county_fips
+    """.format(type_clause=type_clause, state_clause=state_clause)
+    return fetch_df_cached(sql, params)
+
+
+def _monday_week_expr(date_expr: str) -> str:
+    # DATE_TRUNC('week', ...) follows the session's WEEK_START; DAYOFWEEKISO does not,
+    # so week buckets match CountCube's Monday weeks on every connection.
+    return f"DATEADD('day', 1 - DAYOFWEEKISO({date_expr}), {date_expr})"
+
+
 def get_cube_summary(
     state: str,
     start_date: str,
@@ -364,7 +634,7 @@ def get_cube_summary(
     elif grain == "month":
         bucket_expr = f"DATE_TRUNC('month', {effective_date})"
     else:
-        bucket_expr = f"DATE_TRUNC('week', {effective_date})"
+        bucket_expr = _monday_week_expr(effective_date)
 
     type_clause, type_params = _in_clause("dtype", disaster_types)
     params: Dict[str, Any] = {
@@ -389,21 +659,60 @@ def get_cube_summary(
     return fetch_df(sql, params)
 
 
-def get_drilldown(
-    state: str,
-    disaster_type: str,
-    period_bucket: str,
-    grain: str,
-) -> QueryResult:
+def get_daily_cube_counts() -> QueryResult:
+    sql = """
+        SELECT
+          state AS state,
+          disaster_type AS disaster_type,
+          period_day AS period_day,
+          disaster_count AS disaster_count
+        FROM ANALYTICS.GOLD.CUBES_BY_STATE_TYPE_DAY
+        ORDER BY period_day
+    """
+    return fetch_df(sql)
+
+
+def get_daily_cube_refresh_token() -> str:
+    # data_timestamp only moves when the dynamic table refreshes, so it identifies a
+    # loaded cube without scanning the table.
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SHOW DYNAMIC TABLES LIKE 'CUBES_BY_STATE_TYPE_DAY' IN SCHEMA ANALYTICS.GOLD")
+        row = cur.fetchone()
+        if row is None:
+            return ""
+        columns = [str(desc[0]).lower() for desc in cur.description]
+        values = dict(zip(columns, row))
+        return str(values.get("data_timestamp") or values.get("refreshed_on") or "")
+    finally:
+        conn.close()
+
+
+DRILLDOWN_ROW_LIMIT = 5000
+
+
+def _drilldown_bucket_expr(grain: str) -> str:
     effective_date = "COALESCE(disaster_declaration_date, disaster_begin_date, disaster_end_date)"
     if grain == "year":
-        bucket_expr = f"DATE_TRUNC('year', {effective_date})"
-    elif grain == "month":
-        bucket_expr = f"DATE_TRUNC('month', {effective_date})"
-    else:
-        bucket_expr = f"DATE_TRUNC('week', {effective_date})"
+        return f"DATE_TRUNC('year', {effective_date})"
+    if grain == "month":
+        return f"DATE_TRUNC('month', {effective_date})"
+    return _monday_week_expr(effective_date)
 
-    sql = f"""
+
+def _drilldown_params(state: str, disaster_type: str, period_bucket: str) -> Dict[str, Any]:
+    # Cube selections arrive as timestamps or ISO strings; key every caller identically.
+    return {
+        "state": state,
+        "disaster_type": disaster_type,
+        "period_bucket": pd.Timestamp(period_bucket).date().isoformat(),
+    }
+
+
+def _drilldown_sql(grain: str) -> str:
+    bucket_expr = _drilldown_bucket_expr(grain)
+    return f"""
         SELECT
           disaster_id AS disaster_id,
           disaster_declaration_date AS disaster_declaration_date,
@@ -421,18 +730,92 @@ def get_drilldown(
           AND {bucket_expr} = %(period_bucket)s
           AND centroid_lat IS NOT NULL
           AND centroid_lon IS NOT NULL
-        LIMIT 5000
+        LIMIT {DRILLDOWN_ROW_LIMIT}
     """
-    return fetch_df(
-        sql,
-        {
-            "state": state,
-            "disaster_type": disaster_type,
-            "period_bucket": period_bucket,
-        },
+
+
+def _drilldown_aggregated_sql(grain: str) -> str:
+    # One row per (county, declaration name): bounded by counties x declarations, so
+    # large selections are summarized instead of truncated at DRILLDOWN_ROW_LIMIT.
+    bucket_expr = _drilldown_bucket_expr(grain)
+    return f"""
+        SELECT
+          MIN(disaster_id) AS disaster_id,
+          COUNT(DISTINCT disaster_id) AS disaster_count,
+          COUNT(*) AS record_count,
+          MIN(disaster_declaration_date) AS disaster_declaration_date,
+          MIN(disaster_begin_date) AS disaster_begin_date,
+          MAX(disaster_end_date) AS disaster_end_date,
+          disaster_type AS disaster_type,
+          county_name AS county_name,
+          state AS state,
+          declaration_name AS declaration_name,
+          AVG(centroid_lat) AS centroid_lat,
+          AVG(centroid_lon) AS centroid_lon
+        FROM ANALYTICS.SILVER.FCT_DISASTERS
+        WHERE state = %(state)s
+          AND disaster_type = %(disaster_type)s
+          AND {bucket_expr} = %(period_bucket)s
+          AND centroid_lat IS NOT NULL
+          AND centroid_lon IS NOT NULL
+        GROUP BY county_fips, county_name, state, disaster_type, declaration_name
+    """
+
+
+def get_drilldown(
+    state: str,
+    disaster_type: str,
+    period_bucket: str,
+    grain: str,
+) -> QueryResult:
+    return fetch_df_cached(
+        _drilldown_sql(grain),
+        _drilldown_params(state, disaster_type, period_bucket),
     )
 
 
+def get_drilldown_row_count(
+    state: str,
+    disaster_type: str,
+    period_bucket: str,
+    grain: str,
+) -> QueryResult:
+    bucket_expr = _drilldown_bucket_expr(grain)
+    sql = f"""
+        SELECT COUNT(*) AS row_count
+        FROM ANALYTICS.SILVER.FCT_DISASTERS
+        WHERE state = %(state)s
+          AND disaster_type = %(disaster_type)s
+          AND {bucket_expr} = %(period_bucket)s
+          AND centroid_lat IS NOT NULL
+          AND centroid_lon IS NOT NULL
+    """
+    return fetch_df_cached(sql, _drilldown_params(state, disaster_type, period_bucket))
+
+
+def get_drilldown_aggregated(
+    state: str,
+    disaster_type: str,
+    period_bucket: str,
+    grain: str,
+) -> QueryResult:
+    return fetch_df_cached(
+        _drilldown_aggregated_sql(grain),
+        _drilldown_params(state, disaster_type, period_bucket),
+    )
+
+
+def is_drilldown_cached(
+    state: str,
+    disaster_type: str,
+    period_bucket: str,
+    grain: str,
+    aggregated: bool = False,
+) -> bool:
+    sql = _drilldown_aggregated_sql(grain) if aggregated else _drilldown_sql(grain)
+    return is_result_cached(sql, _drilldown_params(state, disaster_type, period_bucket))
+
+
 def get_sunburst_rows(
     start_date: str,
     end_date: str,
@@ -455,7 +838,7 @@ def get_sunburst_rows(
           AND county_fips IS NOT NULL
         GROUP BY disaster_type, declaration_name, state, DATE_TRUNC('year', disaster_declaration_date)
     """.format(type_clause=type_clause)
-    return fetch_df(sql, params)
+    return fetch_df_cached(sql, params)
 
 
 def get_sankey_cache_status_by_year(
@@ -471,21 +854,8 @@ def get_sankey_cache_status_by_year(
               disaster_type AS disaster_type,
               declaration_name AS declaration_name,
               state AS state,
-              SHA2(
-                CONCAT(
-                  COALESCE(disaster_type, ''), '|',
-                  COALESCE(declaration_name, ''), '|',
-                  COALESCE(state, '')
-                ),
-                256
-              ) AS record_id,
-              SHA2(
-                CONCAT(
-                  COALESCE(disaster_type, ''), '|',
-                  COALESCE(declaration_name, '')
-                ),
-                256
-              ) AS source_text_hash
+              {record_id_expr} AS record_id,
+              {source_text_hash_expr} AS source_text_hash
             FROM ANALYTICS.SILVER.FCT_DISASTERS
             WHERE COALESCE(disaster_declaration_date, disaster_begin_date, disaster_end_date)
               >= %(start_date)s
@@ -514,59 +884,64 @@ def get_sankey_cache_status_by_year(
           ON cache.record_id = base.record_id
         GROUP BY year_bucket
         ORDER BY year_bucket
-    """.format(type_clause=type_clause)
+    """.format(
+        record_id_expr=_SANKEY_RECORD_ID_SQL,
+        source_text_hash_expr=_SANKEY_SOURCE_TEXT_HASH_SQL,
+        type_clause=type_clause,
+    )
     return fetch_df(
         sql,
         {"start_date": start_date, "end_date": end_date, **type_params},
     )
 
 
-def get_trends_bump_ranks(
+def get_trends_month_type_counts(start_date: str, end_date: str) -> QueryResult:
+    sql = """
+        SELECT
+          DATE_TRUNC('month', disaster_declaration_date) AS period_bucket,
+          disaster_type AS disaster_type,
+          COUNT(*) AS disaster_count
+        FROM ANALYTICS.SILVER.FCT_DISASTERS
+        WHERE disaster_declaration_date >= %(start_date)s
+          AND disaster_declaration_date < %(end_date)s
+          AND disaster_type IS NOT NULL
+        GROUP BY period_bucket, disaster_type
+        ORDER BY period_bucket, disaster_type
+    """
+    return fetch_df_cached(sql, {"start_date": start_date, "end_date": end_date})
+
+
+def get_bump_drilldown_state_summary(
     binning: str,
-    start_date: str,
-    end_date: str,
-    top_n: int,
+    period_bucket: str,
+    disaster_type: str,
 ) -> QueryResult:
-    if binning == "months":
-        bucket_expr = "DATE_TRUNC('month', disaster_declaration_date)"
-    elif binning == "years":
-        bucket_expr = "DATE_TRUNC('year', disaster_declaration_date)"
-    else:
-        bucket_expr = (
-            "DATE_FROM_PARTS(FLOOR(EXTRACT(year FROM disaster_declaration_date) / 10) * 10, 1, 1)"
-        )
-
-    sql = f"""
-        WITH bucket_counts AS (
-            SELECT
-              {bucket_expr} AS period_bucket,
-              disaster_type AS disaster_type,
-              COUNT(*) AS disaster_count
-            FROM ANALYTICS.SILVER.FCT_DISASTERS
-            WHERE disaster_declaration_date >= %(start_date)s
-              AND disaster_declaration_date < %(end_date)s
-              AND disaster_type IS NOT NULL
-            GROUP BY {bucket_expr}, disaster_type
-        )
+    sql = """
         SELECT
-          period_bucket,
-          disaster_type,
+          state,
           disaster_count,
-          DENSE_RANK() OVER (
-            PARTITION BY period_bucket
-            ORDER BY disaster_count DESC, disaster_type
-          ) AS rank
-        FROM bucket_counts
-        QUALIFY rank <= %(top_n)s
-        ORDER BY period_bucket, rank, disaster_type
+          specific_disasters
+        FROM ANALYTICS.GOLD.BUMP_DRILLDOWN_BY_STATE
+        WHERE binning = %(binning)s
+          AND period_bucket = %(period_start)s
+          AND disaster_type = %(disaster_type)s
+        ORDER BY disaster_count DESC, state
     """
-    return fetch_df(
-        sql,
-        {"start_date": start_date, "end_date": end_date, "top_n": top_n},
-    )
+    params = {
+        "binning": binning if binning in {"months", "years"} else "decades",
+        "period_start": period_bucket,
+        "disaster_type": disaster_type,
+    }
+    try:
+        return fetch_df(sql, params)
+    except Exception as exc:
+        if not is_missing_object_error(exc):
+            raise
+        # Gold drilldown table not deployed yet; aggregate Silver directly.
+        return _get_bump_drilldown_state_summary_silver(binning, period_bucket, disaster_type)
 
 
-def get_bump_drilldown_state_summary(
+def _get_bump_drilldown_state_summary_silver(
     binning: str,
     period_bucket: str,
     disaster_type: str,
@@ -607,6 +982,95 @@ def get_bump_drilldown_state_summary(
     )
 
 
+def get_bump_narratives(inputs_hashes: list[str], llm_model: str) -> QueryResult:
+    if not inputs_hashes:
+        return QueryResult(df=pd.DataFrame(), sql="", params={})
+    sql = """
+        WITH requested AS (
+            SELECT DISTINCT value::STRING AS inputs_hash
+            FROM TABLE(FLATTEN(input => PARSE_JSON(%(inputs_hashes)s)))
+        )
+        SELECT
+          cache.inputs_hash AS inputs_hash,
+          cache.narrative AS narrative
+        FROM ANALYTICS.MONITORING.BUMP_NARRATIVE_CACHE AS cache
+        JOIN requested
+          ON requested.inputs_hash = cache.inputs_hash
+        WHERE cache.llm_model = %(llm_model)s
+    """
+    params = {"inputs_hashes": _json_array_param(inputs_hashes), "llm_model": llm_model}
+    try:
+        return fetch_df(sql, params)
+    except Exception as exc:
+        if not is_missing_object_error(exc):
+            raise
+        # Narrative table not deployed yet; callers generate summaries live.
+        return QueryResult(df=pd.DataFrame(), sql=sql, params=params)
+
+
+def upsert_bump_narratives(
+    rows: list[dict[str, Any]],
+    batch_size: int = 200,
+) -> None:
+    if not rows:
+        return
+
+    columns = ["inputs_hash", "llm_model", "binning", "period_bucket", "disaster_type", "narrative"]
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start : start + batch_size]
+        values_sql = []
+        params: Dict[str, Any] = {}
+        for row_idx, row in enumerate(chunk):
+            placeholders = []
+            for col in columns:
+                key = f"{col}_{start}_{row_idx}"
+                placeholders.append(f"%({key})s")
+                params[key] = row.get(col)
+            values_sql.append("(" + ", ".join(placeholders) + ")")
+
+        sql = f"""
+            MERGE INTO ANALYTICS.MONITORING.BUMP_NARRATIVE_CACHE AS target
+            USING (
+                SELECT
+                  column1 AS inputs_hash,
+                  column2 AS llm_model,
+                  column3 AS binning,
+                  TO_DATE(column4) AS period_bucket,
+                  column5 AS disaster_type,
+                  column6 AS narrative
+                FROM VALUES {", ".join(values_sql)}
+            ) AS source
+            ON target.inputs_hash = source.inputs_hash
+              AND target.llm_model = source.llm_model
+            WHEN MATCHED THEN
+              UPDATE SET
+                narrative = source.narrative,
+                updated_at = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN
+              INSERT (
+                inputs_hash,
+                llm_model,
+                binning,
+                period_bucket,
+                disaster_type,
+                narrative,
+                created_at,
+                updated_at
+              )
+              VALUES (
+                source.inputs_hash,
+                source.llm_model,
+                source.binning,
+                source.period_bucket,
+                source.disaster_type,
+                source.narrative,
+                CURRENT_TIMESTAMP(),
+                CURRENT_TIMESTAMP()
+              )
+        """
+        execute_sql(sql, params)
+
+
 def get_consistency_runs(
     window_start: Optional[str],
     window_end: Optional[str],
@@ -1,33 +1,712 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import html
 import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any, Iterable
 
+import numpy as np
+import pandas as pd
+
+from display_names import format_date_ranges
+
+FIRE_CLUSTER_WINDOW_DAYS = 92
+
+
+NAMED_EVENT_TOKENS = ("named", "named event", "named events")
+DEFAULT_MAX_NODES = 400
+_LAYER_LABELS = {"TH": "themes", "N": "events", "S": "states"}
+_OTHER_TOOLTIP_NAMES = 15
+
+
+def _fire_cluster_ids(states: np.ndarray, event_dates: np.ndarray) -> np.ndarray:
+    # Expects rows sorted by (state, event_date) with NaT last inside each state. A
+    # cluster starts at the first event more than FIRE_CLUSTER_WINDOW_DAYS whole days
+    # after the current cluster start, so cluster starts are found by jumping through
+    # searchsorted offsets (one step per cluster, not per row).
+    row_count = len(states)
+    starts = np.zeros(row_count, dtype=np.int64)
+    if row_count == 0:
+        return starts
+    window = np.timedelta64(FIRE_CLUSTER_WINDOW_DAYS + 1, "D")
+    state_bounds = np.flatnonzero(states[1:] != states[:-1]) + 1
+    group_starts = np.concatenate(([0], state_bounds))
+    group_ends = np.concatenate((state_bounds, [row_count]))
+    for group_start, group_end in zip(group_starts, group_ends):
+        dates = event_dates[group_start:group_end]
+        valid_count = int((~np.isnat(dates)).sum())
+        valid_dates = dates[:valid_count]
+        next_start = np.searchsorted(valid_dates, valid_dates + window, side="left")
+        starts[group_start] = 1
+        position = 0
+        while valid_count and next_start[position] < valid_count:
+            position = int(next_start[position])
+            starts[group_start + position] = 1
+    cluster_ids = np.cumsum(starts)
+    first_ids = np.repeat(cluster_ids[group_starts], group_ends - group_starts)
+    return cluster_ids - first_ids
+
+
+def assign_fire_clusters(fire_df: pd.DataFrame) -> pd.DataFrame:
+    fire_df = fire_df.copy()
+    fire_df["event_date"] = (
+        fire_df["disaster_begin_date"]
+        .fillna(fire_df["disaster_declaration_date"])
+        .fillna(fire_df["disaster_end_date"])
+    )
+    fire_df = fire_df.sort_values(["state", "event_date"])
+    fire_df["fire_cluster_id"] = _fire_cluster_ids(
+        fire_df["state"].to_numpy(dtype=object),
+        fire_df["event_date"].to_numpy(dtype="datetime64[ns]"),
+    )
+    fire_df["cluster_key"] = (
+        fire_df["state"].astype(str) + "|" + fire_df["fire_cluster_id"].astype(str)
+    )
+
+    names = fire_df[["cluster_key", "event_name"]].dropna(subset=["event_name"])
+    names["event_name"] = names["event_name"].astype(str).str.strip()
+    cluster_names = (
+        names.drop_duplicates()
+        .groupby("cluster_key", sort=False)["event_name"]
+        .agg("; ".join)
+        .reindex(fire_df["cluster_key"].unique(), fill_value="")
+    )
+    cluster_labels = "Fire Cluster (" + cluster_names + ")"
+    fire_df["cluster_label"] = fire_df["cluster_key"].map(cluster_labels)
+
+    tooltip_lines = (
+        fire_df["event_name"].astype(str)
+        + ": "
+        + format_date_ranges(
+            fire_df["disaster_begin_date"],
+            fire_df["disaster_end_date"],
+            fire_df["disaster_declaration_date"],
+            empty_text="Unknown date",
+        )
+    )
+    cluster_tooltips = tooltip_lines.groupby(fire_df["cluster_key"], sort=False).agg("\n".join)
+    fire_df["cluster_tooltip"] = fire_df["cluster_key"].map(cluster_tooltips)
+    return fire_df
+
+
+def _missing_text(values: pd.Series) -> pd.Series:
+    # NaN counts as missing: a NaN canonical_event_name falls back to declaration_name
+    # instead of producing a literal "nan" event node as the old inline code did.
+    return values.isna() | values.astype(str).str.strip().eq("")
+
+
+def _combine_enrichment(df: pd.DataFrame, column: str) -> pd.Series:
+    values = df[f"cache_{column}"]
+    llm_column = f"llm_{column}"
+    if llm_column in df.columns:
+        values = values.combine_first(df[llm_column])
+    return values
+
+
+def _normalize_name_groups(df: pd.DataFrame) -> pd.Series:
+    name_group = _combine_enrichment(df, "name_group")
+    name_group = name_group.mask(_missing_text(name_group), "Unnamed").astype(str).str.strip()
+
+    disaster_type = df["disaster_type"].astype(str).str.strip()
+    unnamed_label = ("Unnamed (" + disaster_type + ")").where(disaster_type.ne(""), "Unnamed")
+
+    canonical = df["canonical_event_name"]
+    declaration = df["declaration_name"]
+    candidate = (
+        canonical.mask(_missing_text(canonical), declaration)
+        .mask(lambda values: _missing_text(values), "Unnamed")
+        .astype(str)
+        .str.strip()
+    )
+
+    return pd.Series(
+        np.select(
+            [
+                name_group.eq("Unnamed"),
+                name_group.str.lower().isin(NAMED_EVENT_TOKENS),
+            ],
+            [unnamed_label, candidate],
+            default=name_group,
+        ),
+        index=df.index,
+        dtype=object,
+    )
+
+
+def _event_tooltips(df: pd.DataFrame) -> pd.Series:
+    ranges = (
+        df.groupby(["name_group", "event_name"])
+        .agg(
+            start_min=("begin_date_min", "min"),
+            end_max=("end_date_max", "max"),
+            decl_min=("declaration_date_min", "min"),
+            decl_max=("declaration_date_max", "max"),
+        )
+        .reset_index()
+    )
+    ranges["tooltip_line"] = (
+        ranges["event_name"].astype(str)
+        + ": "
+        + format_date_ranges(
+            ranges["start_min"],
+            ranges["end_max"],
+            ranges["decl_min"],
+            ranges["decl_max"],
+            empty_text="Unknown date",
+        )
+    )
+    lines = ranges.groupby("name_group")["tooltip_line"].agg("\n".join)
+    totals = df.groupby("name_group")["county_count"].sum().astype(int)
+    total_text = (
+        "\n(Total declared county-level disasters: "
+        + totals.reindex(lines.index, fill_value=0).astype(str)
+        + ")"
+    )
+    return lines + total_text
+
+
+def build_sankey_graph(df: pd.DataFrame) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    df = df.copy()
+    df["canonical_event_name"] = _combine_enrichment(df, "canonical_event_name")
+    df["name_group"] = _normalize_name_groups(df)
+
+    df["event_name"] = (
+        df["canonical_event_name"]
+        .fillna(df["declaration_name"])
+        .fillna("Unnamed")
+        .astype(str)
+        .str.strip()
+    )
+    df.loc[df["event_name"] == "", "event_name"] = "Unnamed"
+
+    fire_mask = df["disaster_type"].astype(str).str.lower().eq("fire")
+    if fire_mask.any():
+        fire_df = assign_fire_clusters(df.loc[fire_mask])
+        df.loc[fire_df.index, "name_group"] = fire_df["cluster_label"]
+
+    theme_group = _combine_enrichment(df, "theme_group")
+    df["theme_group"] = theme_group.mask(_missing_text(theme_group), "No Theme")
+
+    flows = pd.DataFrame(
+        {
+            "theme_group": df["theme_group"],
+            "name_group": df["name_group"],
+            "event_name": df["event_name"],
+            "state": df["state"],
+            "county_count": df["county_count"],
+            "begin_date_min": df["disaster_begin_date"],
+            "end_date_max": df["disaster_end_date"],
+            "declaration_date_min": df["disaster_declaration_date"],
+            "declaration_date_max": df["disaster_declaration_date"],
+        }
+    )
+    return build_sankey_graph_from_flows(flows)
+
+
+def build_sankey_graph_from_flows(
+    df: pd.DataFrame,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    # One row per (theme_group, name_group, event_name, state) edge, as produced by
+    # build_sankey_graph or read precomputed from ANALYTICS.GOLD.SANKEY_FLOWS.
+    event_tooltips = _event_tooltips(df)
+    theme_counts = (
+        df.groupby(["theme_group", "name_group"])["county_count"]
+        .sum()
+        .reset_index(name="value")
+    )
+    state_counts = (
+        df.groupby(["name_group", "state"])["county_count"]
+        .sum()
+        .reset_index(name="value")
+    )
+
+    theme_labels = theme_counts["theme_group"].astype(str)
+    theme_names = theme_counts["name_group"].astype(str)
+    state_names = state_counts["name_group"].astype(str)
+    state_labels = state_counts["state"].astype(str)
+
+    # Interleave endpoints in link order so first-seen node order (which seeds the
+    # browser layout) matches the order links are emitted in.
+    node_frame = pd.DataFrame(
+        {
+            "prefix": np.concatenate(
+                [
+                    np.tile(["TH", "N"], len(theme_counts)),
+                    np.tile(["N", "S"], len(state_counts)),
+                ]
+            ),
+            "name": np.concatenate(
+                [
+                    np.column_stack([theme_labels, theme_names]).ravel(),
+                    np.column_stack([state_names, state_labels]).ravel(),
+                ]
+            ),
+        }
+    )
+    node_frame["id"] = node_frame["prefix"] + ":" + node_frame["name"]
+    node_frame = node_frame.drop_duplicates(subset=["id"])
+    node_frame["tooltip"] = node_frame["name"].map(event_tooltips).where(
+        node_frame["prefix"].eq("N")
+    )
+    nodes = []
+    for node_id, name, tooltip in zip(
+        node_frame["id"], node_frame["name"], node_frame["tooltip"]
+    ):
+        node = {"id": node_id, "name": name}
+        if isinstance(tooltip, str) and tooltip:
+            node["tooltip"] = tooltip
+        nodes.append(node)
+
+    link_frame = pd.DataFrame(
+        {
+            "source": np.concatenate(["TH:" + theme_labels, "N:" + state_names]),
+            "target": np.concatenate(["N:" + theme_names, "S:" + state_labels]),
+            "value": np.concatenate(
+                [theme_counts["value"], state_counts["value"]]
+            ).astype(int),
+        }
+    )
+    links = link_frame.to_dict("records")
+    return nodes, links
+
+
+def collapse_sankey_nodes(
+    nodes: list[dict[str, Any]],
+    links: list[dict[str, Any]],
+    max_nodes: int = DEFAULT_MAX_NODES,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], int]:
+    if len(nodes) <= max_nodes:
+        return nodes, links, 0
+
+    in_totals: dict[str, float] = {}
+    out_totals: dict[str, float] = {}
+    for link in links:
+        out_totals[link["source"]] = out_totals.get(link["source"], 0) + link["value"]
+        in_totals[link["target"]] = in_totals.get(link["target"], 0) + link["value"]
+
+    def node_value(node_id: str) -> float:
+        return max(in_totals.get(node_id, 0), out_totals.get(node_id, 0))
+
+    def layer(node_id: str) -> str:
+        return node_id.split(":", 1)[0]
+
+    # Reserve one slot per layer for its "Other" bucket, then keep the heaviest
+    # nodes across all layers; ties keep the earlier node.
+    layers = list(dict.fromkeys(layer(node["id"]) for node in nodes))
+    budget = max(len(layers), max_nodes - len(layers))
+    kept = {
+        node_id
+        for _, _, node_id in heapq.nlargest(
+            budget,
+            ((node_value(node["id"]), -idx, node["id"]) for idx, node in enumerate(nodes)),
+        )
+    }
+
+    collapsed: dict[str, list[dict[str, Any]]] = {}
+    remap: dict[str, str] = {}
+    for node in nodes:
+        node_id = node["id"]
+        if node_id in kept:
+            remap[node_id] = node_id
+        else:
+            prefix = layer(node_id)
+            remap[node_id] = f"{prefix}:__other__"
+            collapsed.setdefault(prefix, []).append(node)
+
+    other_nodes: dict[str, dict[str, Any]] = {}
+    for prefix, members in collapsed.items():
+        noun = _LAYER_LABELS.get(prefix, "nodes")
+        ranked = heapq.nlargest(
+            _OTHER_TOOLTIP_NAMES, members, key=lambda node: node_value(node["id"])
+        )
+        tooltip_lines = [
+            f"{member['name']}: {_format_value(node_value(member['id']))}" for member in ranked
+        ]
+        if len(members) > len(ranked):
+            tooltip_lines.append(f"... and {len(members) - len(ranked)} more")
+        name = f"Other {noun} ({len(members)})"
+        other_nodes[f"{prefix}:__other__"] = {
+            "id": f"{prefix}:__other__",
+            "name": name,
+            "tooltip": name + "\n" + "\n".join(tooltip_lines),
+        }
+
+    reduced_nodes = []
+    seen: set[str] = set()
+    for node in nodes:
+        node_id = remap[node["id"]]
+        if node_id in seen:
+            continue
+        seen.add(node_id)
+        reduced_nodes.append(other_nodes.get(node_id, node))
+
+    merged: dict[tuple[str, str], Any] = {}
+    for link in links:
+        key = (remap[link["source"]], remap[link["target"]])
+        merged[key] = merged.get(key, 0) + link["value"]
+    reduced_links = [
+        {"source": source, "target": target, "value": value}
+        for (source, target), value in merged.items()
+    ]
+    return reduced_nodes, reduced_links, len(nodes) - len(kept)
+
+
+# Categorical palette (Tableau 10) assigned in first-use order, links before nodes.
+SANKEY_PALETTE = (
+    "#4e79a7",
+    "#f28e2c",
+    "#e15759",
+    "#76b7b2",
+    "#59a14f",
+    "#edc949",
+    "#af7aa1",
+    "#ff9da7",
+    "#9c755f",
+    "#bab0ab",
+)
+SANKEY_LAYOUT_WIDTH = 1200
+_HTML_CACHE_MAX_ENTRIES = 64
+_html_cache: OrderedDict[str, str] = OrderedDict()
+_html_cache_lock = threading.Lock()
+
+
+@dataclass
+class SankeyLayout:
+    x0: list[float]
+    x1: list[float]
+    y0: list[float]
+    y1: list[float]
+    node_values: list[float]
+    sources: list[int]
+    targets: list[int]
+    link_widths: list[float]
+    link_y0: list[float]
+    link_y1: list[float]
+
+
+def layout_sankey(
+    nodes: list[dict[str, Any]],
+    links: list[dict[str, Any]],
+    extent: tuple[float, float, float, float],
+    node_width: float = 20,
+    node_padding: float = 14,
+    iterations: int = 6,
+) -> SankeyLayout:
+    # Port of d3-sankey 0.12 (justify alignment, default node and link sorting) so
+    # the browser receives final coordinates instead of running the layout itself.
+    ext_x0, ext_y0, ext_x1, ext_y1 = extent
+    node_count = len(nodes)
+    index_by_id = {node["id"]: idx for idx, node in enumerate(nodes)}
+    sources = [index_by_id[link["source"]] for link in links]
+    targets = [index_by_id[link["target"]] for link in links]
+    link_values = [float(link["value"]) for link in links]
+    source_links: list[list[int]] = [[] for _ in range(node_count)]
+    target_links: list[list[int]] = [[] for _ in range(node_count)]
+    for link_idx, (source, target) in enumerate(zip(sources, targets)):
+        source_links[source].append(link_idx)
+        target_links[target].append(link_idx)
+
+    values = [
+        max(
+            sum(link_values[link] for link in source_links[idx]),
+            sum(link_values[link] for link in target_links[idx]),
+        )
+        for idx in range(node_count)
+    ]
+
+    depths = [0] * node_count
+    current = dict.fromkeys(range(node_count))
+    depth = 0
+    while current:
+        following: dict[int, None] = {}
+        for idx in current:
+            depths[idx] = depth
+            for link in source_links[idx]:
+                following[targets[link]] = None
+        depth += 1
+        if depth > node_count:
+            raise ValueError("circular link")
+        current = following
+
+    layer_count = max(depths, default=0) + 1
+    kx = (ext_x1 - ext_x0 - node_width) / (layer_count - 1) if layer_count > 1 else 0.0
+    columns: list[list[int]] = [[] for _ in range(layer_count)]
+    layers = [0] * node_count
+    x0 = [0.0] * node_count
+    x1 = [0.0] * node_count
+    for idx in range(node_count):
+        layer = depths[idx] if source_links[idx] else layer_count - 1
+        layer = max(0, min(layer_count - 1, layer))
+        layers[idx] = layer
+        x0[idx] = ext_x0 + layer * kx
+        x1[idx] = x0[idx] + node_width
+        columns[layer].append(idx)
+    columns = [column for column in columns if column]
+
+    y0 = [0.0] * node_count
+    y1 = [0.0] * node_count
+    link_widths = [0.0] * len(links)
+    longest = max((len(column) for column in columns), default=1)
+    padding = min(node_padding, (ext_y1 - ext_y0) / (longest - 1)) if longest > 1 else node_padding
+
+    def by_target_breadth(link: int) -> tuple[float, int]:
+        return y0[targets[link]], link
+
+    def by_source_breadth(link: int) -> tuple[float, int]:
+        return y0[sources[link]], link
+
+    def reorder_links(column: list[int]) -> None:
+        for idx in column:
+            source_links[idx].sort(key=by_target_breadth)
+            target_links[idx].sort(key=by_source_breadth)
+
+    def reorder_node_links(idx: int) -> None:
+        for link in target_links[idx]:
+            source_links[sources[link]].sort(key=by_target_breadth)
+        for link in source_links[idx]:
+            target_links[targets[link]].sort(key=by_source_breadth)
+
+    ky = min(
+        (
+            (ext_y1 - ext_y0 - (len(column) - 1) * padding)
+            / max(sum(values[idx] for idx in column), 1e-9)
+            for column in columns
+        ),
+        default=0.0,
+    )
+    for column in columns:
+        y = ext_y0
+        for idx in column:
+            y0[idx] = y
+            y1[idx] = y + values[idx] * ky
+            y = y1[idx] + padding
+            for link in source_links[idx]:
+                link_widths[link] = link_values[link] * ky
+        y = (ext_y1 - y + padding) / (len(column) + 1)
+        for position, idx in enumerate(column):
+            y0[idx] += y * (position + 1)
+            y1[idx] += y * (position + 1)
+        reorder_links(column)
+
+    def target_top(source: int, target: int) -> float:
+        y = y0[source] - (len(source_links[source]) - 1) * padding / 2
+        for link in source_links[source]:
+            if targets[link] == target:
+                break
+            y += link_widths[link] + padding
+        for link in target_links[target]:
+            if sources[link] == source:
+                break
+            y -= link_widths[link]
+        return y
+
+    def source_top(source: int, target: int) -> float:
+        y = y0[target] - (len(target_links[target]) - 1) * padding / 2
+        for link in target_links[target]:
+            if sources[link] == source:
+                break
+            y += link_widths[link] + padding
+        for link in source_links[source]:
+            if targets[link] == target:
+                break
+            y -= link_widths[link]
+        return y
+
+    def resolve_collisions(column: list[int], alpha: float) -> None:
+        middle = len(column) >> 1
+        subject = column[middle]
+        push_up(column, y0[subject] - padding, middle - 1, alpha)
+        push_down(column, y1[subject] + padding, middle + 1, alpha)
+        push_up(column, ext_y1, len(column) - 1, alpha)
+        push_down(column, ext_y0, 0, alpha)
+
+    def push_down(column: list[int], y: float, position: int, alpha: float) -> None:
+        for idx in column[position:]:
+            dy = (y - y0[idx]) * alpha
+            if dy > 1e-6:
+                y0[idx] += dy
+                y1[idx] += dy
+            y = y1[idx] + padding
+
+    def push_up(column: list[int], y: float, position: int, alpha: float) -> None:
+        for idx in reversed(column[: position + 1]) if position >= 0 else ():
+            dy = (y1[idx] - y) * alpha
+            if dy > 1e-6:
+                y0[idx] -= dy
+                y1[idx] -= dy
+            y = y0[idx] - padding
+
+    def relax_left_to_right(alpha: float, beta: float) -> None:
+        for column in columns[1:]:
+            for target in column:
+                y = 0.0
+                weight = 0.0
+                for link in target_links[target]:
+                    source = sources[link]
+                    v = link_values[link] * (layers[target] - layers[source])
+                    y += target_top(source, target) * v
+                    weight += v
+                if not weight > 0:
+                    continue
+                dy = (y / weight - y0[target]) * alpha
+                y0[target] += dy
+                y1[target] += dy
+                reorder_node_links(target)
+            column.sort(key=lambda idx: y0[idx])
+            resolve_collisions(column, beta)
+
+    def relax_right_to_left(alpha: float, beta: float) -> None:
+        for column in reversed(columns[:-1]):
+            for source in column:
+                y = 0.0
+                weight = 0.0
+                for link in source_links[source]:
+                    target = targets[link]
+                    v = link_values[link] * (layers[target] - layers[source])
+                    y += source_top(source, target) * v
+                    weight += v
+                if not weight > 0:
+                    continue
+                dy = (y / weight - y0[source]) * alpha
+                y0[source] += dy
+                y1[source] += dy
+                reorder_node_links(source)
+            column.sort(key=lambda idx: y0[idx])
+            resolve_collisions(column, beta)
+
+    for iteration in range(iterations):
+        alpha = 0.99**iteration
+        beta = max(1 - alpha, (iteration + 1) / iterations)
+        relax_right_to_left(alpha, beta)
+        relax_left_to_right(alpha, beta)
+
+    link_y0 = [0.0] * len(links)
+    link_y1 = [0.0] * len(links)
+    for idx in range(node_count):
+        y = y0[idx]
+        for link in source_links[idx]:
+            link_y0[link] = y + link_widths[link] / 2
+            y += link_widths[link]
+        y = y0[idx]
+        for link in target_links[idx]:
+            link_y1[link] = y + link_widths[link] / 2
+            y += link_widths[link]
+
+    return SankeyLayout(
+        x0=x0,
+        x1=x1,
+        y0=y0,
+        y1=y1,
+        node_values=values,
+        sources=sources,
+        targets=targets,
+        link_widths=link_widths,
+        link_y0=link_y0,
+        link_y1=link_y1,
+    )
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:g}"
+
+
+def _truncate_label(text: str, max_chars: int = 100) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[: max(0, max_chars - 3)] + "..."
+
+
+def _render_svg(
+    nodes: list[dict[str, Any]],
+    links: list[dict[str, Any]],
+    width: int,
+    height: int,
+) -> str:
+    layout = layout_sankey(nodes, links, extent=(1, 5, width - 160, height - 5))
+    palette: dict[str, str] = {}
+
+    def color(key: str) -> str:
+        if key not in palette:
+            palette[key] = SANKEY_PALETTE[len(palette) % len(SANKEY_PALETTE)]
+        return palette[key]
+
+    def label(node: dict[str, Any]) -> str:
+        return str(node.get("name") or node["id"])
+
+    parts = ['<g stroke="#666">']
+    for link_idx, link in enumerate(links):
+        source = layout.sources[link_idx]
+        target = layout.targets[link_idx]
+        sx = layout.x1[source]
+        tx = layout.x0[target]
+        mx = (sx + tx) / 2
+        sy = layout.link_y0[link_idx]
+        ty = layout.link_y1[link_idx]
+        title = f"{label(nodes[source])} → {label(nodes[target])}\n{_format_value(link['value'])}"
+        parts.append(
+            f'<path class="link" data-s="{source}" data-t="{target}" '
+            f'd="M{sx:.2f},{sy:.2f}C{mx:.2f},{sy:.2f},{mx:.2f},{ty:.2f},{tx:.2f},{ty:.2f}" '
+            f'stroke-width="{max(1.0, layout.link_widths[link_idx]):.2f}" '
+            f'stroke="{color(label(nodes[source]))}">'
+            f"<title>{html.escape(title)}</title></path>"
+        )
+    parts.append("</g><g>")
+    for idx, node in enumerate(nodes):
+        name = label(node)
+        tooltip = str(node.get("tooltip") or name)
+        x0, x1, y0, y1 = layout.x0[idx], layout.x1[idx], layout.y0[idx], layout.y1[idx]
+        left = x0 < width / 2
+        parts.append(
+            f'<g class="node" data-i="{idx}">'
+            f'<rect x="{x0:.2f}" y="{y0:.2f}" height="{y1 - y0:.2f}" width="{x1 - x0:.2f}" '
+            f'fill="{color(name)}"><title>'
+            f"{html.escape(tooltip)}\n{_format_value(layout.node_values[idx])}</title></rect>"
+            f'<text x="{(x1 + 6) if left else (x0 - 6):.2f}" y="{(y0 + y1) / 2:.2f}" '
+            f'dy="0.35em" text-anchor="{"start" if left else "end"}">'
+            f"{html.escape(_truncate_label(name))}<title>{html.escape(tooltip)}</title></text>"
+            "</g>"
+        )
+    parts.append("</g>")
+    return "".join(parts)
+
 
 def render_sankey(
     nodes: Iterable[dict[str, Any]],
     links: Iterable[dict[str, Any]],
     height: int = 600,
+    width: int = SANKEY_LAYOUT_WIDTH,
 ) -> str:
-    payload = {
-        "nodes": list(nodes),
-        "links": list(links),
-    }
-    data_json = json.dumps(payload, ensure_ascii=True)
+    nodes = list(nodes)
+    links = list(links)
+    payload = json.dumps(
+        {"nodes": nodes, "links": links, "height": height, "width": width},
+        ensure_ascii=True,
+        sort_keys=True,
+    )
+    cache_key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    with _html_cache_lock:
+        cached = _html_cache.get(cache_key)
+        if cached is not None:
+            _html_cache.move_to_end(cache_key)
+    if cached is not None:
+        return cached
 
-    return f"""
+    svg_body = _render_svg(nodes, links, width, height)
+    page = f"""
 <!DOCTYPE html>
 <html>
   <head>
     <meta charset="utf-8" />
-    <script src="https://cdn.jsdelivr.net/npm/d3@7/dist/d3.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/d3-sankey@0.12.3/dist/d3-sankey.min.js"></script>
     <style>
       body {{
         margin: 0;
         font-family: sans-serif;
       }}
-      #sankey {{
+      #sankey svg {{
         width: 100%;
         height: {height}px;
       }}
@@ -40,6 +719,11 @@ def render_sankey(
         font-size: 11px;
         fill: #1f1f1f;
       }}
+      .node .label-bg {{
+        fill: #ffffff;
+        stroke: #000000;
+        stroke-width: 0.5px;
+      }}
       .link {{
         fill: none;
         stroke-opacity: 0.35;
@@ -57,137 +741,68 @@ def render_sankey(
     </style>
   </head>
   <body>
-    <div id="sankey"></div>
+    <div id="sankey">
+      <svg viewBox="0 0 {width} {height}" preserveAspectRatio="xMinYMin meet">{svg_body}</svg>
+    </div>
     <script>
-      const payload = {data_json};
-      const width = document.getElementById("sankey").clientWidth || 900;
-      const height = {height};
-      const svg = d3.select("#sankey")
-        .append("svg")
-        .attr("viewBox", [0, 0, width, height])
-        .attr("width", width)
-        .attr("height", height);
-
-      const color = d3.scaleOrdinal(d3.schemeTableau10);
-      const truncateLabel = (text, maxChars = 100) => {{
-        if (!text) return "";
-        if (text.length <= maxChars) return text;
-        return text.slice(0, Math.max(0, maxChars - 3)) + "...";
-      }};
-      const rightPadding = 160;
-      const sankey = d3.sankey()
-        .nodeId(d => d.id)
-        .nodeWidth(20)
-        .nodePadding(14)
-        .extent([[1, 5], [width - rightPadding, height - 5]]);
-
-      const graph = sankey({{
-        nodes: payload.nodes.map(d => Object.assign({{}}, d)),
-        links: payload.links.map(d => Object.assign({{}}, d))
+      const svgNs = "http://www.w3.org/2000/svg";
+      const links = Array.from(document.querySelectorAll(".link"));
+      const nodes = Array.from(document.querySelectorAll(".node"));
+      const outgoing = new Map();
+      const incoming = new Map();
+      links.forEach(link => {{
+        if (!outgoing.has(link.dataset.s)) outgoing.set(link.dataset.s, []);
+        if (!incoming.has(link.dataset.t)) incoming.set(link.dataset.t, []);
+        outgoing.get(link.dataset.s).push(link);
+        incoming.get(link.dataset.t).push(link);
       }});
 
-      const linkGroup = svg.append("g")
-        .attr("stroke", "#666")
-        .selectAll("path")
-        .data(graph.links)
-        .join("path")
-        .attr("class", "link")
-        .attr("d", d3.sankeyLinkHorizontal())
-        .attr("stroke-width", d => Math.max(1, d.width))
-        .attr("stroke", d => color(d.source.name || d.source.id))
-        .append("title")
-        .text(d => `${{d.source.name || d.source.id}} → ${{d.target.name || d.target.id}}\\n${{d.value}}`);
-
-      const node = svg.append("g")
-        .selectAll("g")
-        .data(graph.nodes)
-        .join("g")
-        .attr("class", "node");
-
-      node.append("rect")
-        .attr("x", d => d.x0)
-        .attr("y", d => d.y0)
-        .attr("height", d => d.y1 - d.y0)
-        .attr("width", d => d.x1 - d.x0)
-        .attr("fill", d => color(d.name || d.id))
-        .append("title")
-        .text(d => `${{d.tooltip || d.name || d.id}}\\n${{d.value}}`);
-
-      const labels = node.append("text")
-        .attr("x", d => d.x0 < width / 2 ? d.x1 + 6 : d.x0 - 6)
-        .attr("y", d => (d.y0 + d.y1) / 2)
-        .attr("dy", "0.35em")
-        .attr("text-anchor", d => d.x0 < width / 2 ? "start" : "end")
-        .text(d => truncateLabel(d.name || d.id));
-
-      labels.append("title")
-        .text(d => d.tooltip || d.name || d.id);
-
-      labels.each(function() {{
-        const text = d3.select(this);
-        const bbox = this.getBBox();
+      nodes.forEach(node => {{
+        const text = node.querySelector("text");
+        const bbox = text.getBBox();
         const padding = 2;
-        d3.select(this.parentNode)
-          .insert("rect", "text")
-          .attr("class", "label-bg")
-          .attr("x", bbox.x - padding)
-          .attr("y", bbox.y - padding)
-          .attr("width", bbox.width + padding * 2)
-          .attr("height", bbox.height + padding * 2)
-          .attr("fill", "#ffffff")
-          .attr("stroke", "#000000")
-          .attr("stroke-width", 0.5)
-          .attr("rx", 2)
-          .attr("ry", 2);
+        const bg = document.createElementNS(svgNs, "rect");
+        bg.setAttribute("class", "label-bg");
+        bg.setAttribute("x", bbox.x - padding);
+        bg.setAttribute("y", bbox.y - padding);
+        bg.setAttribute("width", bbox.width + padding * 2);
+        bg.setAttribute("height", bbox.height + padding * 2);
+        bg.setAttribute("rx", 2);
+        bg.setAttribute("ry", 2);
+        node.insertBefore(bg, text);
       }});
 
-      const collectUpstream = (node, acc = new Set()) => {{
-        if (!node || acc.has(node.id)) return acc;
-        acc.add(node.id);
-        (node.sourceLinks || []).forEach(link => {{
-          acc.add(link);
-          collectUpstream(link.source, acc);
-        }});
-        return acc;
-      }};
-
-      const collectDownstream = (node, acc = new Set()) => {{
-        if (!node || acc.has(node.id)) return acc;
-        acc.add(node.id);
-        (node.targetLinks || []).forEach(link => {{
-          acc.add(link);
-          collectDownstream(link.target, acc);
-        }});
-        return acc;
-      }};
-
       const highlightFlow = (link) => {{
-        const upstream = collectUpstream(link.source);
-        const downstream = collectDownstream(link.target);
-        const highlightLinks = new Set([link]);
-        graph.links.forEach(l => {{
-          if (upstream.has(l) || downstream.has(l)) {{
-            highlightLinks.add(l);
-          }}
-        }});
+        const highlightLinks = new Set([
+          link,
+          ...(outgoing.get(link.dataset.s) || []),
+          ...(incoming.get(link.dataset.t) || []),
+        ]);
         const highlightNodes = new Set();
         highlightLinks.forEach(l => {{
-          highlightNodes.add(l.source);
-          highlightNodes.add(l.target);
+          highlightNodes.add(l.dataset.s);
+          highlightNodes.add(l.dataset.t);
         }});
-        svg.selectAll(".link").classed("highlighted", d => highlightLinks.has(d));
-        svg.selectAll(".node").classed("highlighted", d => highlightNodes.has(d));
+        links.forEach(l => l.classList.toggle("highlighted", highlightLinks.has(l)));
+        nodes.forEach(n => n.classList.toggle("highlighted", highlightNodes.has(n.dataset.i)));
       }};
 
       const clearHighlight = () => {{
-        svg.selectAll(".link").classed("highlighted", false);
-        svg.selectAll(".node").classed("highlighted", false);
+        links.forEach(l => l.classList.remove("highlighted"));
+        nodes.forEach(n => n.classList.remove("highlighted"));
       }};
 
-      svg.selectAll(".link")
-        .on("mouseover", (event, d) => highlightFlow(d))
-        .on("mouseout", () => clearHighlight());
+      links.forEach(link => {{
+        link.addEventListener("mouseover", () => highlightFlow(link));
+        link.addEventListener("mouseout", clearHighlight);
+      }});
     </script>
   </body>
 </html>
 """
+    with _html_cache_lock:
+        _html_cache[cache_key] = page
+        _html_cache.move_to_end(cache_key)
+        while len(_html_cache) > _HTML_CACHE_MAX_ENTRIES:
+            _html_cache.popitem(last=False)
+    return page
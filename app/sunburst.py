@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+SUNBURST_CUSTOMDATA_COLUMNS = ["node_type", "category", "year", "event", "state"]
+SUNBURST_NODE_COLUMNS = ["id", "label", "parent", "value", "color", *SUNBURST_CUSTOMDATA_COLUMNS]
+ROOT_ID = "root"
+ROOT_LABEL = "Named Events"
+ROOT_COLOR = "#ffffff"
+CATEGORY_COLOR = "#dddddd"
+MISSING_YEAR_COLOR = "#cccccc"
+
+
+def _level_frame(
+    totals: pd.DataFrame,
+    node_type: str,
+    node_id: pd.Series,
+    parent: pd.Series,
+    label: pd.Series,
+    color: Any,
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": node_id,
+            "label": label,
+            "parent": parent,
+            "value": totals["value"].to_numpy(dtype=np.int64),
+            "color": color,
+            "node_type": node_type,
+            "category": totals["disaster_type"],
+            "year": totals["year"] if "year" in totals else None,
+            "event": totals["event"] if "event" in totals else None,
+            "state": totals["state"] if "state" in totals else None,
+        }
+    )
+
+
+def build_sunburst_nodes(df: pd.DataFrame, year_colors: dict[str, str]) -> pd.DataFrame:
+    # Levels are aggregated bottom-up and each level's ids are built by concatenating
+    # whole columns, so node count no longer drives a Python-level loop.
+    states = (
+        df.groupby(["disaster_type", "year", "event", "state"])["county_count"]
+        .sum()
+        .reset_index(name="value")
+    )
+    events = states.groupby(["disaster_type", "year", "event"])["value"].sum().reset_index()
+    years = events.groupby(["disaster_type", "year"])["value"].sum().reset_index()
+    categories = years.groupby("disaster_type")["value"].sum().reset_index()
+
+    category_ids = "category:" + categories["disaster_type"].astype(str)
+    year_parents = "category:" + years["disaster_type"].astype(str)
+    year_ids = year_parents + "|year:" + years["year"].astype(str)
+    event_parents = (
+        "category:" + events["disaster_type"].astype(str) + "|year:" + events["year"].astype(str)
+    )
+    event_ids = event_parents + "|event:" + events["event"].astype(str)
+    state_parents = (
+        "category:"
+        + states["disaster_type"].astype(str)
+        + "|year:"
+        + states["year"].astype(str)
+        + "|event:"
+        + states["event"].astype(str)
+    )
+    state_ids = state_parents + "|state:" + states["state"].astype(str)
+
+    def _year_color(frame: pd.DataFrame) -> pd.Series:
+        return frame["year"].map(year_colors).fillna(MISSING_YEAR_COLOR)
+
+    root = pd.DataFrame(
+        {
+            "id": [ROOT_ID],
+            "label": [ROOT_LABEL],
+            "parent": [""],
+            "value": [int(states["value"].sum())],
+            "color": [ROOT_COLOR],
+            "node_type": ["root"],
+        }
+    )
+    nodes = pd.concat(
+        [
+            root,
+            _level_frame(
+                categories,
+                "category",
+                category_ids,
+                pd.Series(ROOT_ID, index=categories.index),
+                categories["disaster_type"],
+                CATEGORY_COLOR,
+            ),
+            _level_frame(years, "year", year_ids, year_parents, years["year"].astype(str), _year_color(years)),
+            _level_frame(events, "event", event_ids, event_parents, events["event"], _year_color(events)),
+            _level_frame(states, "state", state_ids, state_parents, states["state"], _year_color(states)),
+        ],
+        ignore_index=True,
+    )
+    return nodes.reindex(columns=SUNBURST_NODE_COLUMNS)
+
+
+@dataclass
+class SunburstTree:
+    # Parent pointers plus Euler-tour intervals over a node frame: the subtree of node v
+    # is dfs_order[tin[v]:tout[v]], and leaf totals come from prefix sums over that order.
+    ids: pd.Index
+    parent_idx: np.ndarray
+    tin: np.ndarray
+    tout: np.ndarray
+    dfs_order: np.ndarray
+    leaf_value_prefix: np.ndarray
+
+    @classmethod
+    def from_nodes(cls, nodes: pd.DataFrame) -> "SunburstTree":
+        ids = pd.Index(nodes["id"])
+        parent_idx = ids.get_indexer(nodes["parent"]).astype(np.int64)
+        node_count = len(ids)
+        depth = np.zeros(node_count, dtype=np.int64)
+        frontier = parent_idx >= 0
+        ancestor = parent_idx.copy()
+        while frontier.any():
+            depth[frontier] += 1
+            ancestor[frontier] = parent_idx[ancestor[frontier]]
+            frontier &= ancestor >= 0
+
+        # Subtree sizes accumulate bottom-up one depth level at a time.
+        size = np.ones(node_count, dtype=np.int64)
+        for level in range(int(depth.max(initial=0)), 0, -1):
+            members = np.flatnonzero(depth == level)
+            np.add.at(size, parent_idx[members], size[members])
+
+        # Entry times are assigned top-down: a child starts after its parent and the
+        # subtrees of its earlier siblings.
+        tin = np.zeros(node_count, dtype=np.int64)
+        roots = np.flatnonzero(parent_idx < 0)
+        tin[roots] = np.cumsum(size[roots]) - size[roots]
+        for level in range(1, int(depth.max(initial=0)) + 1):
+            members = np.flatnonzero(depth == level)
+            members = members[np.argsort(parent_idx[members], kind="stable")]
+            parents = parent_idx[members]
+            running = np.cumsum(size[members])
+            group_start = np.r_[True, parents[1:] != parents[:-1]]
+            group_base = np.maximum.accumulate(np.where(group_start, running - size[members], 0))
+            tin[members] = tin[parents] + 1 + running - size[members] - group_base
+        tout = tin + size
+        dfs_order = np.empty(node_count, dtype=np.int64)
+        dfs_order[tin] = np.arange(node_count)
+
+        values = nodes["value"].to_numpy(dtype=np.int64)
+        leaf_values = np.where(size[dfs_order] == 1, values[dfs_order], 0)
+        return cls(
+            ids=ids,
+            parent_idx=parent_idx,
+            tin=tin,
+            tout=tout,
+            dfs_order=dfs_order,
+            leaf_value_prefix=np.r_[0, np.cumsum(leaf_values)],
+        )
+
+    def subtree(self, nodes: pd.DataFrame, node_id: str) -> pd.DataFrame:
+        position = self.ids.get_indexer([node_id])[0]
+        if position < 0:
+            return nodes
+        # Sorting the slice keeps the node frame's level-by-level order.
+        members = np.sort(self.dfs_order[self.tin[position] : self.tout[position]])
+        subtree = nodes.iloc[members].copy()
+        subtree["value"] = (
+            self.leaf_value_prefix[self.tout[members]] - self.leaf_value_prefix[self.tin[members]]
+        )
+        subtree.loc[subtree["id"] == node_id, "parent"] = ""
+        return subtree
+
+
+def sunburst_node_selection(customdata: Any) -> Optional[dict[str, str]]:
+    # Click payloads carry customdata as a positional array; session state and the
+    # narrative modal keep using the keyed form.
+    if isinstance(customdata, dict):
+        return customdata
+    if customdata is None or isinstance(customdata, str):
+        return None
+    values = list(customdata)
+    if len(values) != len(SUNBURST_CUSTOMDATA_COLUMNS):
+        return None
+    return {
+        key: str(value)
+        for key, value in zip(SUNBURST_CUSTOMDATA_COLUMNS, values)
+        if value is not None and not (isinstance(value, float) and np.isnan(value)) and value != ""
+    }
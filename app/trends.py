@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+BUMP_COLUMNS = ["period_bucket", "disaster_type", "disaster_count", "rank"]
+TRENDS_FIRST_YEAR = 1953
+TRENDS_DEFAULT_MONTH_START = dt.date(2023, 1, 1)
+TRENDS_DEFAULT_MONTH_END = dt.date(2025, 12, 31)
+TRENDS_DEFAULT_TOP_N = 5
+
+
+def _rebin_months(months: np.ndarray, binning: str) -> np.ndarray:
+    if binning == "months":
+        return months
+    years = months.astype("datetime64[Y]")
+    if binning == "years":
+        return years
+    year_numbers = years.astype(np.int64) + 1970
+    decades = (year_numbers // 10) * 10
+    return (decades - 1970).astype("datetime64[Y]")
+
+
+def rank_bump_periods(month_counts: pd.DataFrame, binning: str, top_n: int) -> pd.DataFrame:
+    # Local equivalent of DENSE_RANK() OVER (PARTITION BY period_bucket ORDER BY
+    # disaster_count DESC, disaster_type): the order key is unique per period, so the
+    # dense rank is the row position within each period.
+    if month_counts.empty or top_n <= 0:
+        return pd.DataFrame(columns=BUMP_COLUMNS)
+    months = pd.to_datetime(month_counts["period_bucket"]).to_numpy().astype("datetime64[M]")
+    buckets = _rebin_months(months, binning).astype("datetime64[D]")
+    type_codes, type_labels = pd.factorize(month_counts["disaster_type"], sort=True)
+    bucket_codes, bucket_labels = pd.factorize(buckets, sort=True)
+    pair_codes = bucket_codes.astype(np.int64) * len(type_labels) + type_codes
+    pairs, inverse = np.unique(pair_codes, return_inverse=True)
+    counts = np.bincount(
+        inverse,
+        weights=month_counts["disaster_count"].to_numpy(dtype=np.float64),
+        minlength=len(pairs),
+    ).astype(np.int64)
+    pair_buckets = pairs // len(type_labels)
+    pair_types = pairs % len(type_labels)
+    # Type codes follow sorted type names, so this lexsort matches the SQL ordering.
+    order = np.lexsort((pair_types, -counts, pair_buckets))
+    pair_buckets = pair_buckets[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(pair_buckets)) + 1]
+    ranks = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)])) + 1
+    keep = ranks <= top_n
+    order = order[keep]
+    return pd.DataFrame(
+        {
+            "period_bucket": pd.to_datetime(np.asarray(bucket_labels)[pair_buckets[keep]]),
+            "disaster_type": np.asarray(type_labels)[pair_types[order]],
+            "disaster_count": counts[order],
+            "rank": ranks[keep],
+        }
+    )
+
+
+def bump_period_label(period_bucket, binning: str) -> str:
+    period_dt = pd.to_datetime(period_bucket, errors="coerce")
+    if pd.isna(period_dt):
+        return str(period_bucket)
+    if binning == "months":
+        return period_dt.strftime("%b %Y")
+    if binning == "years":
+        return period_dt.strftime("%Y")
+    return f"{period_dt.strftime('%Y')}s"
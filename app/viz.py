@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import functools
 import hashlib
-import math
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
 
 import pandas as pd
 import plotly.express as px
@@ -9,13 +14,67 @@ import plotly.graph_objects as go
 import numpy as np
 
 
-def _jitter_pair(lat: float, lon: float, seed: str, scale: float = 0.06) -> tuple[float, float]:
-    digest = hashlib.md5(seed.encode("utf-8")).hexdigest()[:8]
-    angle = (int(digest[:4], 16) / 16**4) * (2 * math.pi)
-    radius = (int(digest[4:], 16) / 16**4) * scale
-    return lat + math.cos(angle) * radius, lon + math.sin(angle) * radius
+FIGURE_CACHE_MAX_ENTRIES = 64
+_figure_cache: OrderedDict[str, str] = OrderedDict()
+_figure_cache_lock = threading.Lock()
 
 
+def _frame_fingerprint(df: pd.DataFrame) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(df.columns), [str(dtype) for dtype in df.dtypes])).encode("utf-8"))
+    try:
+        hashes = pd.util.hash_pandas_object(df, index=True)
+    except TypeError:
+        # Columns holding dicts or lists are not hashable; fall back to their reprs.
+        hashes = pd.util.hash_pandas_object(df.astype(str), index=True)
+    digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _cached_figure(builder: Callable[..., go.Figure]) -> Callable[..., go.Figure]:
+    # Figures are stored as JSON so callers can mutate what they get back (update_layout
+    # and friends) without touching the cached copy.
+    @functools.wraps(builder)
+    def wrapper(df: pd.DataFrame, *args: Any, **kwargs: Any) -> go.Figure:
+        key = json.dumps(
+            [builder.__name__, _frame_fingerprint(df), args, kwargs],
+            sort_keys=True,
+            default=str,
+        )
+        with _figure_cache_lock:
+            payload = _figure_cache.get(key)
+            if payload is not None:
+                _figure_cache.move_to_end(key)
+        if payload is not None:
+            # The payload came from a validated figure, so skip re-validation.
+            return go.Figure(json.loads(payload), _validate=False)
+        fig = builder(df, *args, **kwargs)
+        payload = fig.to_json()
+        with _figure_cache_lock:
+            _figure_cache[key] = payload
+            while len(_figure_cache) > FIGURE_CACHE_MAX_ENTRIES:
+                _figure_cache.popitem(last=False)
+        return fig
+
+    return wrapper
+
+
+def _jitter_coords(
+    lat: pd.Series,
+    lon: pd.Series,
+    seeds: pd.Series,
+    scale: float = 0.06,
+) -> tuple[np.ndarray, np.ndarray]:
+    # hash_array uses a fixed key, so each seed maps to the same offset on every rerun.
+    hashes = pd.util.hash_array(seeds.to_numpy(dtype=object))
+    angle = ((hashes >> np.uint64(48)) & np.uint64(0xFFFF)) / 65536.0 * (2 * np.pi)
+    radius = ((hashes >> np.uint64(32)) & np.uint64(0xFFFF)) / 65536.0 * scale
+    lat_values = pd.to_numeric(lat, errors="coerce").to_numpy(dtype=float)
+    lon_values = pd.to_numeric(lon, errors="coerce").to_numpy(dtype=float)
+    return lat_values + np.cos(angle) * radius, lon_values + np.sin(angle) * radius
+
+
+@_cached_figure
 def build_choropleth(df: pd.DataFrame):
     fig = px.choropleth(
         df,
@@ -36,6 +95,57 @@ def build_choropleth(df: pd.DataFrame):
     return fig
 
 
+COUNTY_GEOJSON_DIR = Path(__file__).resolve().parents[1] / "data" / "county_geojson"
+
+
+_county_geojson_cache: dict[str, dict[str, Any]] = {}
+
+
+def load_county_geojson(level: str = "national") -> Optional[dict[str, Any]]:
+    # Pre-simplified by scripts/build_county_geojson.py; parsed once per process.
+    if level not in _county_geojson_cache:
+        path = COUNTY_GEOJSON_DIR / f"counties_{level}.geojson"
+        if not path.exists():
+            return None
+        _county_geojson_cache[level] = json.loads(path.read_text(encoding="utf-8"))
+    return _county_geojson_cache[level]
+
+
+@_cached_figure
+def build_county_choropleth(df: pd.DataFrame, level: str = "national"):
+    geojson = load_county_geojson(level)
+    if geojson is None:
+        raise FileNotFoundError(
+            f"County GeoJSON for level '{level}' is missing; run scripts/build_county_geojson.py."
+        )
+    # Ship only the outlines that carry data so single-state views stay small.
+    wanted = set(df["county_fips"].astype(str))
+    features = [feature for feature in geojson["features"] if feature["id"] in wanted]
+    fig = go.Figure(
+        go.Choropleth(
+            geojson={"type": "FeatureCollection", "features": features},
+            locations=df["county_fips"].astype(str),
+            z=np.log1p(df["disaster_count"].astype(float)),
+            customdata=np.column_stack(
+                [df["state"].astype(str), df["county_name"].astype(str), df["disaster_count"]]
+            ),
+            colorscale="Reds",
+            showscale=False,
+            marker={"line": {"color": "#ffffff", "width": 0.2}},
+            hovertemplate=(
+                "County: %{customdata[1]}, %{customdata[0]}<br>"
+                "County-level declared disasters: %{customdata[2]}<extra></extra>"
+            ),
+        )
+    )
+    if level == "national":
+        fig.update_geos(scope="usa")
+    else:
+        fig.update_geos(fitbounds="locations", visible=False)
+    return fig
+
+
+@_cached_figure
 def build_cube_grid(df: pd.DataFrame, grain: str):
     df = df.copy()
     df["period_bucket"] = pd.to_datetime(df["period_bucket"])
@@ -74,156 +184,178 @@ def build_cube_grid(df: pd.DataFrame, grain: str):
     return fig
 
 
-def build_drilldown(df: pd.DataFrame, color_map: dict[str, str] | None = None):
+DRILLDOWN_WEBGL_THRESHOLD = 1500
+
+
+def _map_view(lat: pd.Series, lon: pd.Series) -> tuple[dict[str, float], float]:
+    lat_min, lat_max = float(lat.min()), float(lat.max())
+    lon_min, lon_max = float(lon.min()), float(lon.max())
+    span = max(lon_max - lon_min, (lat_max - lat_min) * 2, 0.5)
+    zoom = float(np.clip(np.log2(360.0 / span) - 0.3, 1.0, 10.0))
+    return {"lat": (lat_min + lat_max) / 2, "lon": (lon_min + lon_max) / 2}, zoom
+
+
+def build_drilldown(
+    df: pd.DataFrame,
+    color_map: dict[str, str] | None = None,
+    webgl_threshold: int = DRILLDOWN_WEBGL_THRESHOLD,
+):
     df = df.copy()
     name_column = "display_name" if "display_name" in df.columns else "declaration_name"
-    df[["lat_jitter", "lon_jitter"]] = df.apply(
-        lambda row: _jitter_pair(
-            float(row["centroid_lat"]),
-            float(row["centroid_lon"]),
-            f"{row['disaster_id']}-{row[name_column]}",
-        ),
-        axis=1,
-        result_type="expand",
+    df["lat_jitter"], df["lon_jitter"] = _jitter_coords(
+        df["centroid_lat"],
+        df["centroid_lon"],
+        df["disaster_id"].astype(str) + "-" + df[name_column].astype(str),
     )
-    fig = px.scatter_geo(
-        df,
-        lat="lat_jitter",
-        lon="lon_jitter",
-        hover_name=name_column,
-        color=name_column,
-        color_discrete_map=color_map,
-        hover_data={
-            "disaster_id": True,
-            "disaster_declaration_date": True,
-            "disaster_type": True,
-            "county_name": True,
-            "state": True,
-            "centroid_lat": False,
-            "centroid_lon": False,
-            "lat_jitter": False,
-            "lon_jitter": False,
-        },
-        custom_data=["display_name", "hover_start_date", "hover_end_date", "county_name"],
-        scope="usa",
+    aggregated = "record_count" in df.columns
+    hover_data = {
+        "disaster_id": True,
+        "disaster_declaration_date": True,
+        "disaster_type": True,
+        "county_name": True,
+        "state": True,
+        "centroid_lat": False,
+        "centroid_lon": False,
+        "lat_jitter": False,
+        "lon_jitter": False,
+    }
+    custom_data = ["display_name", "hover_start_date", "hover_end_date", "county_name"]
+    hovertemplate = (
+        "<b>%{customdata[0]}</b><br>"
+        "<br>"
+        "Declaration Start Date: %{customdata[1]}<br>"
+        "Declaration End Date: %{customdata[2]}<br>"
+        "County: %{customdata[3]}"
     )
-    fig.update_traces(
-        hovertemplate=(
-            "<b>%{customdata[0]}</b><br>"
-            "<br>"
-            "Declaration Start Date: %{customdata[1]}<br>"
-            "Declaration End Date: %{customdata[2]}<br>"
-            "County: %{customdata[3]}<extra></extra>"
+    if aggregated:
+        hover_data["record_count"] = False
+        custom_data.append("record_count")
+        hovertemplate += "<br>County-level records: %{customdata[4]}"
+    scatter_args = {
+        "lat": "lat_jitter",
+        "lon": "lon_jitter",
+        "hover_name": name_column,
+        "color": name_column,
+        "color_discrete_map": color_map,
+        "size": "record_count" if aggregated else None,
+        "size_max": 18,
+        "hover_data": hover_data,
+        "custom_data": custom_data,
+    }
+    if len(df) > webgl_threshold:
+        # SVG geo markers stall the browser past a few thousand points; mapbox traces
+        # draw through WebGL and stay interactive at tens of thousands.
+        center, zoom = _map_view(df["lat_jitter"], df["lon_jitter"])
+        fig = px.scatter_mapbox(
+            df,
+            **scatter_args,
+            center=center,
+            zoom=zoom,
+            mapbox_style="carto-positron",
         )
-    )
+        fig.update_traces(hovertemplate=hovertemplate + "<extra></extra>")
+        if not aggregated:
+            fig.update_traces(marker={"size": 7})
+        return fig
+    fig = px.scatter_geo(df, **scatter_args, scope="usa")
+    fig.update_traces(hovertemplate=hovertemplate + "<extra></extra>")
     fig.update_geos(fitbounds="locations")
     return fig
 
 
+@_cached_figure
 def build_bump_chart(df: pd.DataFrame, binning: str = "decades"):
+    df = df.dropna(subset=["disaster_type"])
     if df.empty:
         return go.Figure()
-    df = df.copy()
-    df["period_bucket"] = pd.to_datetime(df["period_bucket"])
-    if binning == "months":
-        df["period_label"] = df["period_bucket"].dt.strftime("%b %Y")
-    elif binning == "years":
-        df["period_label"] = df["period_bucket"].dt.strftime("%Y")
-    else:
-        df["period_label"] = df["period_bucket"].dt.strftime("%Y") + "s"
-    types = sorted(df["disaster_type"].dropna().unique().tolist())
-    palette = px.colors.qualitative.Safe + px.colors.qualitative.Plotly
-    color_map = {t: palette[i % len(palette)] for i, t in enumerate(types)}
+    # One sort gives every type a contiguous, period-ordered run of rows; traces are
+    # then sliced out of shared arrays instead of re-filtering the frame per type.
+    df = df.assign(period_bucket=pd.to_datetime(df["period_bucket"])).sort_values(
+        ["disaster_type", "period_bucket"], kind="stable"
+    )
+    type_values = df["disaster_type"].to_numpy(dtype=object)
+    periods = df["period_bucket"].to_numpy()
+    ranks = df["rank"].to_numpy()
+    labels = ("#" + df["rank"].astype(int).astype(str)).to_numpy(dtype=object)
+    customdata = np.empty((len(df), 3), dtype=object)
+    customdata[:, 0] = df["period_bucket"].dt.strftime("%Y-%m-%d").to_numpy(dtype=object)
+    customdata[:, 1] = type_values
+    customdata[:, 2] = df["disaster_count"].astype(int).tolist()
+    starts = np.r_[0, np.flatnonzero(type_values[1:] != type_values[:-1]) + 1]
+    ends = np.r_[starts[1:], len(df)]
 
-    fig = go.Figure()
+    palette = px.colors.qualitative.Safe + px.colors.qualitative.Plotly
     period_label_name = "Decade"
+    period_format = "%{customdata[0]|%Y}s<br>"
     if binning == "years":
         period_label_name = "Year"
+        period_format = "%{customdata[0]|%Y}<br>"
     elif binning == "months":
         period_label_name = "Month"
+        period_format = "%{customdata[0]|%b %Y}<br>"
+    hovertemplate = (
+        "Disaster type: %{customdata[1]}<br>"
+        f"{period_label_name}: "
+        + period_format
+        + "Rank: %{y}<br>"
+        "Count: %{customdata[2]}<extra></extra>"
+    )
 
-    for disaster_type, group in df.groupby("disaster_type"):
-        group = group.sort_values("period_bucket")
-        labels = [f"#{int(r)}" for r in group["rank"].tolist()]
-        customdata = [
-            [d.strftime("%Y-%m-%d"), disaster_type]
-            for d in group["period_bucket"].tolist()
-        ]
-        fig.add_trace(
-            go.Scatter(
-                x=group["period_bucket"],
-                y=group["rank"],
-                mode="lines",
-                line={"color": color_map.get(disaster_type), "width": 2},
-                name=disaster_type,
-                customdata=customdata,
-                hoverinfo="skip",
-                showlegend=False,
-            )
+    traces = []
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        disaster_type = type_values[start]
+        color = palette[i % len(palette)]
+        shared = {
+            "type": "scatter",
+            "x": periods[start:end],
+            "y": ranks[start:end],
+            "name": disaster_type,
+            "customdata": customdata[start:end],
+        }
+        traces.append(
+            {
+                **shared,
+                "mode": "lines",
+                "line": {"color": color, "width": 2},
+                "hoverinfo": "skip",
+                "showlegend": False,
+            }
         )
-        fig.add_trace(
-            go.Scatter(
-                x=group["period_bucket"],
-                y=group["rank"],
-                mode="markers+text",
-                text=labels,
-                textposition="middle center",
-                textfont={"color": "#ffffff"},
-                marker={
-                    "size": 26,
-                    "color": color_map.get(disaster_type),
-                    "line": {"width": 1, "color": "#333"},
-                },
-                name=disaster_type,
-                customdata=customdata,
-                hovertemplate=(
-                    "Disaster type: %{customdata[1]}<br>"
-                    f"{period_label_name}: "
-                    + (
-                        "%{customdata[0]|%b %Y}<br>"
-                        if binning == "months"
-                        else "%{customdata[0]|%Y}s<br>"
-                        if binning == "decades"
-                        else "%{customdata[0]|%Y}<br>"
-                    )
-                    + "Rank: %{y}<br>"
-                    "Count: %{customdata[2]}<extra></extra>"
-                ),
-                showlegend=True,
-            )
+        traces.append(
+            {
+                **shared,
+                "mode": "markers+text",
+                "text": labels[start:end],
+                "textposition": "middle center",
+                "textfont": {"color": "#ffffff"},
+                "marker": {"size": 26, "color": color, "line": {"width": 1, "color": "#333"}},
+                "hovertemplate": hovertemplate,
+                "showlegend": True,
+            }
         )
 
-    # Attach counts to hover customdata
-    for trace in fig.data:
-        if not getattr(trace, 'customdata', None):
-            continue
-        disaster_type = trace.name
-        if not disaster_type:
-            continue
-        group = df[df["disaster_type"] == disaster_type].sort_values("period_bucket")
-        customdata = [
-            [d.strftime("%Y-%m-%d"), disaster_type, int(c)]
-            for d, c in zip(group["period_bucket"].tolist(), group["disaster_count"].tolist())
-        ]
-        trace.customdata = customdata
-
-    fig.update_yaxes(
-        autorange="reversed",
-        title="Rank (1 = most frequent)",
-        tickmode="linear",
-        tick0=1,
-        dtick=1,
-    )
     if binning == "months":
-        fig.update_xaxes(title="Month", tickformat="%b %Y")
+        xaxis = {"title": {"text": "Month"}, "tickformat": "%b %Y"}
     elif binning == "years":
-        fig.update_xaxes(title="Year", tickformat="%Y")
+        xaxis = {"title": {"text": "Year"}, "tickformat": "%Y"}
     else:
-        fig.update_xaxes(title="Decade", tickformat="%Y", ticklabelmode="period")
-    fig.update_layout(legend_title_text="Disaster type")
-    return fig
+        xaxis = {"title": {"text": "Decade"}, "tickformat": "%Y", "ticklabelmode": "period"}
+    layout = {
+        "xaxis": xaxis,
+        "yaxis": {
+            "autorange": "reversed",
+            "title": {"text": "Rank (1 = most frequent)"},
+            "tickmode": "linear",
+            "tick0": 1,
+            "dtick": 1,
+        },
+        "legend": {"title": {"text": "Disaster type"}},
+    }
+    # The trace specs are built from known-good literals, so skip per-trace validation.
+    return go.Figure({"data": traces, "layout": layout}, _validate=False)
 
 
+@_cached_figure
 def build_sunburst(nodes: pd.DataFrame) -> go.Figure:
     if nodes.empty:
         return go.Figure()
@@ -234,7 +366,11 @@ def build_sunburst(nodes: pd.DataFrame) -> go.Figure:
                 labels=nodes["label"],
                 parents=nodes["parent"],
                 values=nodes["value"],
-                customdata=nodes["customdata"],
+                customdata=(
+                    nodes[["node_type", "category", "year", "event", "state"]]
+                    .fillna("")
+                    .to_numpy(dtype=object)
+                ),
                 marker={"colors": nodes["color"], "line": {"color": "#ffffff", "width": 1}},
                 hovertemplate="%{label}<br>Count: %{value}<extra></extra>",
                 branchvalues="total",
@@ -0,0 +1,101 @@
+import argparse
+import hashlib
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+app_dir = Path(__file__).resolve().parents[1] / "app"
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from viz import _jitter_coords  # noqa: E402
+
+POINT_COUNTS = [5_000, 50_000, 500_000]
+JITTER_SCALE = 0.06
+
+
+def _synthetic_drilldown(point_count: int, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "disaster_id": rng.integers(1_000, 5_000, point_count).astype(str),
+            "display_name": [f"Event {idx % 900}" for idx in rng.integers(0, 10**6, point_count)],
+            "centroid_lat": rng.uniform(25.0, 49.0, point_count),
+            "centroid_lon": rng.uniform(-124.0, -67.0, point_count),
+        }
+    )
+
+
+def _legacy_jitter_pair(lat: float, lon: float, seed: str) -> tuple[float, float]:
+    digest = hashlib.md5(seed.encode("utf-8")).hexdigest()[:8]
+    angle = (int(digest[:4], 16) / 16**4) * (2 * math.pi)
+    radius = (int(digest[4:], 16) / 16**4) * JITTER_SCALE
+    return lat + math.cos(angle) * radius, lon + math.sin(angle) * radius
+
+
+def _legacy_jitter(df: pd.DataFrame) -> pd.DataFrame:
+    return df.apply(
+        lambda row: _legacy_jitter_pair(
+            float(row["centroid_lat"]),
+            float(row["centroid_lon"]),
+            f"{row['disaster_id']}-{row['display_name']}",
+        ),
+        axis=1,
+        result_type="expand",
+    )
+
+
+def _vectorized_jitter(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    return _jitter_coords(
+        df["centroid_lat"],
+        df["centroid_lon"],
+        df["disaster_id"].astype(str) + "-" + df["display_name"].astype(str),
+        scale=JITTER_SCALE,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark drilldown marker jitter.")
+    parser.add_argument(
+        "--skip-legacy-above",
+        type=int,
+        default=500_000,
+        help="Skip the row-wise md5 variant for point counts above this value.",
+    )
+    args = parser.parse_args()
+
+    print(f"{'points':>8} {'legacy s':>9} {'numpy s':>8} {'speedup':>8} {'stable':>7} {'max off':>8}")
+    for count in POINT_COUNTS:
+        df = _synthetic_drilldown(count)
+        if count <= args.skip_legacy_above:
+            started = time.perf_counter()
+            _legacy_jitter(df)
+            legacy_s = time.perf_counter() - started
+        else:
+            legacy_s = float("nan")
+
+        started = time.perf_counter()
+        lat, lon = _vectorized_jitter(df)
+        vectorized_s = time.perf_counter() - started
+
+        # Reordering rows must not move any point: offsets depend only on the seed.
+        shuffled = df.sample(frac=1.0, random_state=3)
+        lat_again, lon_again = _vectorized_jitter(shuffled)
+        order = shuffled.index.to_numpy()
+        stable = np.array_equal(lat[order], lat_again) and np.array_equal(lon[order], lon_again)
+        max_offset = float(
+            np.hypot(lat - df["centroid_lat"].to_numpy(), lon - df["centroid_lon"].to_numpy()).max()
+        )
+        print(
+            f"{count:>8} {legacy_s:>9.3f} {vectorized_s:>8.3f} "
+            f"{legacy_s / vectorized_s:>7.1f}x {str(stable):>7} {max_offset:>8.4f}",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+app_dir = Path(__file__).resolve().parents[1] / "app"
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from sankey import assign_fire_clusters  # noqa: E402
+
+STATES = [
+    "AK", "AL", "AR", "AZ", "CA", "CO", "FL", "GA", "HI", "ID", "KS", "MT", "NM", "NV",
+    "OK", "OR", "SD", "TN", "TX", "UT", "WA", "WY",
+]
+
+
+def _synthetic_fire_year(row_count: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    year_start = np.datetime64("2020-01-01")
+    begin = year_start + rng.integers(0, 366, row_count).astype("timedelta64[D]")
+    end = begin + rng.integers(0, 45, row_count).astype("timedelta64[D]")
+    declaration = begin + rng.integers(0, 10, row_count).astype("timedelta64[D]")
+    df = pd.DataFrame(
+        {
+            "state": rng.choice(STATES, row_count),
+            "event_name": [f"Fire {idx % 4000}" for idx in rng.integers(0, 10**6, row_count)],
+            "disaster_begin_date": pd.to_datetime(begin),
+            "disaster_end_date": pd.to_datetime(end),
+            "disaster_declaration_date": pd.to_datetime(declaration),
+        }
+    )
+    missing_begin = rng.random(row_count) < 0.05
+    df.loc[missing_begin, ["disaster_begin_date", "disaster_end_date"]] = pd.NaT
+    return df
+
+
+def _legacy_format_event_range(row: pd.Series) -> str:
+    start = row.get("disaster_begin_date")
+    end = row.get("disaster_end_date")
+    if pd.isna(start) and pd.isna(end):
+        start = row.get("disaster_declaration_date")
+        end = row.get("disaster_declaration_date")
+    if pd.isna(start) and pd.isna(end):
+        return "Unknown date"
+    if pd.isna(end) or start == end:
+        return pd.to_datetime(start).strftime("%Y-%m-%d")
+    return (
+        f"{pd.to_datetime(start).strftime('%Y-%m-%d')} "
+        f"to {pd.to_datetime(end).strftime('%Y-%m-%d')}"
+    )
+
+
+def _legacy_fire_clusters(df: pd.DataFrame) -> tuple[pd.Series, dict, dict]:
+    fire_df = df.copy()
+    fire_df["event_date"] = fire_df["disaster_begin_date"]
+    fire_df.loc[fire_df["event_date"].isna(), "event_date"] = fire_df["disaster_declaration_date"]
+    fire_df.loc[fire_df["event_date"].isna(), "event_date"] = fire_df["disaster_end_date"]
+    fire_df = fire_df.sort_values(["state", "event_date"]).reset_index()
+    cluster_ids = []
+    current_state = None
+    cluster_start = None
+    cluster_id = 0
+    for _, row in fire_df.iterrows():
+        state = row["state"]
+        event_date = row["event_date"]
+        if current_state != state:
+            current_state = state
+            cluster_id = 0
+            cluster_start = event_date
+        if (
+            cluster_start is not None
+            and event_date is not None
+            and not pd.isna(cluster_start)
+            and not pd.isna(event_date)
+            and (event_date - cluster_start).days > 92
+        ):
+            cluster_id += 1
+            cluster_start = event_date
+        cluster_ids.append(cluster_id)
+    fire_df["fire_cluster_id"] = cluster_ids
+    fire_df["cluster_key"] = (
+        fire_df["state"].astype(str) + "|" + fire_df["fire_cluster_id"].astype(str)
+    )
+    cluster_labels = {}
+    cluster_tooltips = {}
+    for cluster_key, group in fire_df.groupby("cluster_key"):
+        event_names = group["event_name"].dropna().astype(str).str.strip().unique().tolist()
+        cluster_labels[cluster_key] = "Fire Cluster (" + "; ".join(event_names) + ")"
+        tooltip_lines = []
+        for _, row in group.iterrows():
+            tooltip_lines.append(f"{row['event_name']}: {_legacy_format_event_range(row)}")
+        cluster_tooltips[cluster_key] = "\n".join(tooltip_lines)
+    keys = pd.Series(fire_df["cluster_key"].values, index=fire_df["index"].values)
+    return keys.sort_index(), cluster_labels, cluster_tooltips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Sankey fire-cluster detection.")
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    df = _synthetic_fire_year(args.rows)
+
+    started = time.perf_counter()
+    legacy_keys, legacy_labels, legacy_tooltips = _legacy_fire_clusters(df)
+    legacy_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    clusters = assign_fire_clusters(df)
+    vectorized_s = time.perf_counter() - started
+
+    keys = clusters["cluster_key"].sort_index()
+    labels = dict(zip(clusters["cluster_key"], clusters["cluster_label"]))
+    tooltips = dict(zip(clusters["cluster_key"], clusters["cluster_tooltip"]))
+    identical = (
+        keys.equals(legacy_keys) and labels == legacy_labels and tooltips == legacy_tooltips
+    )
+
+    print(f"rows={args.rows} clusters={len(labels)} identical={identical}")
+    print(f"legacy iterrows: {legacy_s:.3f}s")
+    print(f"vectorized:      {vectorized_s:.3f}s ({legacy_s / vectorized_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
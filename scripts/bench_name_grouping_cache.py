@@ -0,0 +1,82 @@
+import argparse
+import hashlib
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+app_dir = Path(__file__).resolve().parents[1] / "app"
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from queries import fetch_df, get_name_grouping_cache  # noqa: E402
+
+ID_COUNTS = [100, 1_000, 10_000, 50_000]
+
+
+def _synthetic_ids(count: int) -> list[str]:
+    return [hashlib.sha256(f"bench|{idx}".encode("utf-8")).hexdigest() for idx in range(count)]
+
+
+def _legacy_in_list_lookup(record_ids: list[str]) -> tuple[str, Dict[str, Any]]:
+    placeholders = []
+    params: Dict[str, Any] = {}
+    for idx, record_id in enumerate(record_ids):
+        key = f"rid{idx}"
+        placeholders.append(f"%({key})s")
+        params[key] = record_id
+    sql = f"""
+        SELECT record_id, source_text_hash, name_group, theme_group
+        FROM ANALYTICS.MONITORING.DISASTER_NAME_GROUPING_CACHE
+        WHERE record_id IN ({", ".join(placeholders)})
+    """
+    return sql, params
+
+
+def _time_call(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare IN-list vs JSON-array lookups against the name grouping cache."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--skip-legacy-above",
+        type=int,
+        default=50_000,
+        help="Skip the IN-list variant for ID counts above this value.",
+    )
+    args = parser.parse_args()
+
+    # Warm the connection and warehouse before timing.
+    get_name_grouping_cache(_synthetic_ids(10))
+
+    print(f"{'ids':>8} {'in-list s':>10} {'in-list KB':>11} {'json s':>8} {'json KB':>8}")
+    for count in ID_COUNTS:
+        record_ids = _synthetic_ids(count)
+        legacy_sql, legacy_params = _legacy_in_list_lookup(record_ids)
+        legacy_kb = (len(legacy_sql) + sum(len(v) for v in legacy_params.values())) / 1024
+        if count <= args.skip_legacy_above:
+            legacy_s = _time_call(lambda: fetch_df(legacy_sql, legacy_params), args.repeat)
+            legacy_text = f"{legacy_s:>10.3f}"
+        else:
+            legacy_text = f"{'skipped':>10}"
+        json_result = get_name_grouping_cache(record_ids)
+        json_kb = (len(json_result.sql) + sum(len(v) for v in json_result.params.values())) / 1024
+        json_s = _time_call(lambda: get_name_grouping_cache(record_ids), args.repeat)
+        print(
+            f"{count:>8} {legacy_text} {legacy_kb:>11.1f} {json_s:>8.3f} {json_kb:>8.1f}",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
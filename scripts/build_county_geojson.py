@@ -0,0 +1,124 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import requests
+
+COUNTY_GEOJSON_URL = (
+    "https://raw.githubusercontent.com/plotly/datasets/master/geojson-counties-fips.json"
+)
+OUTPUT_DIR = Path("data/county_geojson")
+
+# Douglas-Peucker tolerance and coordinate rounding (degrees) per zoom level: "national"
+# backs the all-states map, "state" the single-state view.
+LEVELS = {
+    "national": {"tolerance": 0.02, "decimals": 2},
+    "state": {"tolerance": 0.003, "decimals": 3},
+}
+
+
+def _simplify_ring(points: np.ndarray, tolerance: float) -> np.ndarray:
+    if len(points) <= 4:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end <= start + 1:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1 : end] - points[start]
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        idx = int(np.argmax(distances))
+        if distances[idx] > tolerance:
+            split = start + 1 + idx
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    simplified = points[keep]
+    # Rings need at least four positions; keep the original shape for tiny islands.
+    return simplified if len(simplified) >= 4 else points
+
+
+def _quantize_ring(points: np.ndarray, decimals: int) -> list[list[float]]:
+    rounded = np.round(points, decimals)
+    changed = np.ones(len(rounded), dtype=bool)
+    changed[1:] = np.any(rounded[1:] != rounded[:-1], axis=1)
+    rounded = rounded[changed]
+    if len(rounded) < 4:
+        return []
+    if not np.array_equal(rounded[0], rounded[-1]):
+        rounded = np.vstack([rounded, rounded[:1]])
+    return rounded.tolist()
+
+
+def _simplify_polygon(rings: list, tolerance: float, decimals: int) -> list:
+    simplified = []
+    for ring in rings:
+        quantized = _quantize_ring(_simplify_ring(np.asarray(ring, dtype=float), tolerance), decimals)
+        if quantized:
+            simplified.append(quantized)
+    return simplified
+
+
+def _simplify_feature(feature: dict, tolerance: float, decimals: int) -> dict | None:
+    geometry = feature["geometry"]
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    else:
+        polygons = geometry["coordinates"]
+    simplified = [
+        polygon
+        for polygon in (_simplify_polygon(rings, tolerance, decimals) for rings in polygons)
+        if polygon
+    ]
+    if not simplified:
+        return None
+    return {
+        "type": "Feature",
+        "id": str(feature["id"]).zfill(5),
+        "properties": {"name": feature.get("properties", {}).get("NAME", "")},
+        "geometry": (
+            {"type": "Polygon", "coordinates": simplified[0]}
+            if len(simplified) == 1
+            else {"type": "MultiPolygon", "coordinates": simplified}
+        ),
+    }
+
+
+def main() -> None:
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    resp = requests.get(COUNTY_GEOJSON_URL, timeout=120)
+    resp.raise_for_status()
+    source = resp.json()
+    source_kb = len(resp.content) / 1024
+
+    for level, settings in LEVELS.items():
+        features = [
+            simplified
+            for simplified in (
+                _simplify_feature(feature, settings["tolerance"], settings["decimals"])
+                for feature in source["features"]
+            )
+            if simplified is not None
+        ]
+        output_path = OUTPUT_DIR / f"counties_{level}.geojson"
+        payload = json.dumps(
+            {"type": "FeatureCollection", "features": features},
+            separators=(",", ":"),
+        )
+        output_path.write_text(payload, encoding="utf-8")
+        print(
+            f"Wrote {len(features)} counties to {output_path} "
+            f"({len(payload) / 1024:.0f} KB, source {source_kb:.0f} KB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
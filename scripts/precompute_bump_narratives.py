@@ -0,0 +1,120 @@
+import argparse
+import datetime as dt
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+app_dir = Path(__file__).resolve().parents[1] / "app"
+if str(app_dir) not in sys.path:
+    sys.path.insert(0, str(app_dir))
+
+from narratives import (  # noqa: E402
+    bump_narrative_hash,
+    bump_narrative_inputs,
+    bump_narrative_model,
+    generate_bump_narrative,
+    get_stored_bump_narratives,
+)
+from queries import (  # noqa: E402
+    get_bump_drilldown_state_summary,
+    get_disaster_date_bounds,
+    get_trends_month_type_counts,
+    upsert_bump_narratives,
+)
+from trends import (  # noqa: E402
+    TRENDS_DEFAULT_MONTH_END,
+    TRENDS_DEFAULT_MONTH_START,
+    TRENDS_DEFAULT_TOP_N,
+    TRENDS_FIRST_YEAR,
+    rank_bump_periods,
+)
+
+DEFAULT_BINNINGS = ["decades", "years", "months"]
+UPSERT_BATCH_SIZE = 25
+
+
+def _print_status(message: str) -> None:
+    print(message, flush=True)
+
+
+def _default_range(binning: str) -> tuple[dt.date, dt.date]:
+    # Mirrors the Trends tab defaults so the precomputed cells are the ones users see
+    # before touching any filter.
+    if binning == "months":
+        return TRENDS_DEFAULT_MONTH_START, TRENDS_DEFAULT_MONTH_END
+    bounds_df = get_disaster_date_bounds().df
+    if not bounds_df.empty and bounds_df.at[0, "max_date"] is not None:
+        max_year = pd.to_datetime(bounds_df.at[0, "max_date"]).year
+    else:
+        max_year = dt.date.today().year
+    return dt.date(TRENDS_FIRST_YEAR, 1, 1), dt.date(max_year + 1, 1, 1)
+
+
+def _visible_cells(binning: str, top_n: int) -> list[tuple[str, str, str]]:
+    start, end = _default_range(binning)
+    month_counts = get_trends_month_type_counts(start.isoformat(), end.isoformat()).df
+    ranks = rank_bump_periods(month_counts, binning, top_n)
+    return [
+        (binning, period.strftime("%Y-%m-%d"), disaster_type)
+        for period, disaster_type in zip(ranks["period_bucket"], ranks["disaster_type"])
+    ]
+
+
+def _cell_inputs(cell: tuple[str, str, str]) -> dict:
+    binning, period_bucket, disaster_type = cell
+    summary_df = get_bump_drilldown_state_summary(binning, period_bucket, disaster_type).df
+    return bump_narrative_inputs(binning, period_bucket, disaster_type, summary_df)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute bump chart LLM narratives.")
+    parser.add_argument("--binnings", nargs="+", choices=DEFAULT_BINNINGS, default=DEFAULT_BINNINGS)
+    parser.add_argument("--top-n", type=int, default=TRENDS_DEFAULT_TOP_N)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--force", action="store_true", help="Regenerate stored narratives.")
+    args = parser.parse_args()
+
+    model = bump_narrative_model()
+    cells = [cell for binning in args.binnings for cell in _visible_cells(binning, args.top_n)]
+    _print_status(f"{len(cells)} visible cells, model={model}, concurrency={args.concurrency}")
+
+    # Both the state summaries and the LLM calls fan out over the same bounded pool so
+    # neither Snowflake nor OpenAI sees more than --concurrency requests at once.
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        inputs = list(executor.map(_cell_inputs, cells))
+        hashes = [bump_narrative_hash(item) for item in inputs]
+        stored = {} if args.force else get_stored_bump_narratives(hashes, model)
+        pending = {
+            inputs_hash: item
+            for inputs_hash, item in zip(hashes, inputs)
+            if inputs_hash not in stored
+        }
+        _print_status(f"{len(stored)} already stored, {len(pending)} to generate")
+
+        futures = {
+            executor.submit(generate_bump_narrative, item, model): item
+            for item in pending.values()
+        }
+        rows: list[dict] = []
+        failed = 0
+        for done, future in enumerate(as_completed(futures), start=1):
+            item = futures[future]
+            label = f"{item['binning']}/{item['period_label']}/{item['disaster_type']}"
+            try:
+                rows.append(future.result())
+                _print_status(f"[{done}/{len(futures)}] {label}")
+            except Exception as exc:
+                failed += 1
+                _print_status(f"[{done}/{len(futures)}] {label} failed: {exc}")
+            if len(rows) >= UPSERT_BATCH_SIZE:
+                upsert_bump_narratives(rows)
+                rows = []
+        upsert_bump_narratives(rows)
+
+    _print_status(f"Done: {len(futures) - failed} generated, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 import datetime as dt
-import hashlib
 import os
 import sys
 from pathlib import Path
@@ -14,6 +13,7 @@ from queries import (  # noqa: E402
     get_disaster_date_bounds,
     get_distinct_disaster_types,
     get_sankey_rows,
+    refresh_sankey_flows,
     upsert_name_grouping_cache,
 )
 from llm import group_sankey_names  # noqa: E402
@@ -23,10 +23,6 @@ CHUNK_SIZE = 50
 TIMEOUT_S = 60
 
 
-def _hash_text(value: str) -> str:
-    return hashlib.sha256(value.encode("utf-8")).hexdigest()
-
-
 def _print_status(message: str) -> None:
     print(message, flush=True)
 
@@ -35,13 +31,6 @@ def _build_records(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     df["state"] = df["state"].fillna("Unknown").astype(str).str.strip()
     df["declaration_name"] = df["declaration_name"].fillna("").astype(str).str.strip()
-    df["record_id"] = (
-        df["disaster_type"].astype(str)
-        + "|"
-        + df["declaration_name"].astype(str)
-        + "|"
-        + df["state"].astype(str)
-    ).map(_hash_text)
     df["disaster_declaration_date"] = pd.to_datetime(df["disaster_declaration_date"])
     df["disaster_begin_date"] = pd.to_datetime(df.get("disaster_begin_date"), errors="coerce")
     df["disaster_end_date"] = pd.to_datetime(df.get("disaster_end_date"), errors="coerce")
@@ -51,9 +40,6 @@ def _build_records(df: pd.DataFrame) -> pd.DataFrame:
         .combine_first(df["disaster_end_date"])
     )
     df["year"] = effective_date.dt.year.astype(int).astype(str)
-    df["source_text_hash"] = (
-        df["disaster_type"].astype(str) + "|" + df["declaration_name"]
-    ).map(_hash_text)
     return df[
         ["record_id", "year", "disaster_type", "declaration_name", "source_text_hash"]
     ]
@@ -131,6 +117,9 @@ def main() -> None:
                 _print_status(f"LLM {year}/{disaster_type}: no rows to upsert")
         if year_rows == 0:
             _print_status(f"{year}: no records across types")
+        else:
+            refresh_sankey_flows(year)
+            _print_status(f"{year}: refreshed GOLD.SANKEY_FLOWS")
 
 
 if __name__ == "__main__":
@@ -46,3 +46,56 @@ SELECT
   COUNT(*) AS disaster_count
 FROM ANALYTICS.SILVER.FCT_DISASTERS
 GROUP BY state, disaster_type, period_week;
+
+-- Daily grain backs the in-memory count cube in app/cube.py; week buckets straddle
+-- year boundaries, so coarser tables cannot answer arbitrary date ranges exactly.
+-- Days use the same effective date as the Map View fallback and drilldown queries.
+CREATE OR REPLACE DYNAMIC TABLE ANALYTICS.GOLD.CUBES_BY_STATE_TYPE_DAY
+  TARGET_LAG = '1 hour'
+  WAREHOUSE = COMPUTE_WH
+AS
+SELECT
+  state,
+  disaster_type,
+  COALESCE(disaster_declaration_date, disaster_begin_date, disaster_end_date) AS period_day,
+  COUNT(*) AS disaster_count
+FROM ANALYTICS.SILVER.FCT_DISASTERS
+WHERE COALESCE(disaster_declaration_date, disaster_begin_date, disaster_end_date) IS NOT NULL
+GROUP BY state, disaster_type, period_day;
+
+-- Bump chart drilldowns: one row per binning/period/type/state with the distinct
+-- declaration names pre-aggregated, so a chart click reads rows instead of LISTAGG.
+CREATE OR REPLACE DYNAMIC TABLE ANALYTICS.GOLD.BUMP_DRILLDOWN_BY_STATE
+  TARGET_LAG = '1 hour'
+  WAREHOUSE = COMPUTE_WH
+AS
+WITH binned AS (
+  SELECT 'months' AS binning, period_month AS period_bucket, disaster_type, state, declaration_name
+  FROM ANALYTICS.SILVER.FCT_DISASTERS
+  WHERE disaster_type IS NOT NULL
+  UNION ALL
+  SELECT 'years' AS binning, period_year AS period_bucket, disaster_type, state, declaration_name
+  FROM ANALYTICS.SILVER.FCT_DISASTERS
+  WHERE disaster_type IS NOT NULL
+  UNION ALL
+  SELECT
+    'decades' AS binning,
+    DATE_FROM_PARTS(FLOOR(YEAR(disaster_declaration_date) / 10) * 10, 1, 1) AS period_bucket,
+    disaster_type,
+    state,
+    declaration_name
+  FROM ANALYTICS.SILVER.FCT_DISASTERS
+  WHERE disaster_type IS NOT NULL
+)
+SELECT
+  binning,
+  period_bucket,
+  disaster_type,
+  state,
+  COUNT(*) AS disaster_count,
+  LISTAGG(
+    DISTINCT NULLIF(TRIM(declaration_name), ''),
+    ', '
+  ) WITHIN GROUP (ORDER BY NULLIF(TRIM(declaration_name), '')) AS specific_disasters
+FROM binned
+GROUP BY binning, period_bucket, disaster_type, state;
@@ -20,3 +20,15 @@ ALTER TABLE ANALYTICS.MONITORING.DISASTER_NAME_GROUPING_CACHE
 
 ALTER TABLE ANALYTICS.MONITORING.DISASTER_NAME_GROUPING_CACHE
   ADD COLUMN IF NOT EXISTS theme_confidence FLOAT;
+
+-- Sunburst event grouping: one canonical label per declaration name and model, so new
+-- sessions only send names that have never been grouped to the LLM.
+CREATE TABLE IF NOT EXISTS ANALYTICS.MONITORING.DECLARATION_NAME_GROUPING_CACHE (
+  name_hash STRING NOT NULL,
+  llm_model STRING NOT NULL,
+  declaration_name STRING,
+  grouped_label STRING,
+  created_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+  updated_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+  PRIMARY KEY (name_hash, llm_model)
+);
@@ -0,0 +1,245 @@
+-- Annual Disaster Themes: precomputed theme -> event -> state flows per year and type.
+-- Rows are only materialized for years whose name grouping cache is complete, so the
+-- app can read them directly and fall back to on-the-fly enrichment otherwise.
+
+CREATE OR REPLACE VIEW ANALYTICS.GOLD.V_SANKEY_FLOWS_SOURCE AS
+WITH base AS (
+  SELECT
+    YEAR(COALESCE(disaster_declaration_date, disaster_begin_date, disaster_end_date)) AS year,
+    disaster_type,
+    declaration_name,
+    state,
+    -- Must match _SANKEY_RECORD_ID_SQL / _SANKEY_SOURCE_TEXT_HASH_SQL in app/queries.py.
+    SHA2(CONCAT(COALESCE(disaster_type, 'None'), '|', COALESCE(TRIM(declaration_name), ''), '|', COALESCE(TRIM(state), 'Unknown')), 256) AS record_id,
+    SHA2(CONCAT(COALESCE(disaster_type, 'None'), '|', COALESCE(TRIM(declaration_name), '')), 256) AS source_text_hash,
+    COUNT(DISTINCT county_fips) AS county_count,
+    MIN(disaster_declaration_date) AS disaster_declaration_date,
+    MIN(disaster_begin_date) AS disaster_begin_date,
+    MAX(disaster_end_date) AS disaster_end_date
+  FROM ANALYTICS.SILVER.FCT_DISASTERS
+  WHERE state IS NOT NULL
+    AND county_fips IS NOT NULL
+    AND COALESCE(disaster_declaration_date, disaster_begin_date, disaster_end_date) IS NOT NULL
+  GROUP BY 1, disaster_type, declaration_name, state
+),
+enriched AS (
+  SELECT
+    base.*,
+    NULLIF(TRIM(cache.name_group), '') AS cache_name_group,
+    cache.theme_group AS cache_theme_group,
+    cache.canonical_event_name AS cache_canonical_event_name,
+    (
+      cache.record_id IS NULL
+      OR cache.source_text_hash IS DISTINCT FROM base.source_text_hash
+    ) AS needs_enrich
+  FROM base
+  LEFT JOIN ANALYTICS.MONITORING.DISASTER_NAME_GROUPING_CACHE AS cache
+    ON cache.record_id = base.record_id
+),
+complete_years AS (
+  SELECT year
+  FROM enriched
+  GROUP BY year
+  HAVING COUNT_IF(needs_enrich) = 0
+),
+normalized AS (
+  SELECT
+    e.year,
+    e.disaster_type,
+    e.state,
+    e.county_count,
+    e.disaster_declaration_date,
+    e.disaster_begin_date,
+    e.disaster_end_date,
+    IFF(
+      e.cache_theme_group IS NULL OR TRIM(e.cache_theme_group) = '',
+      'No Theme',
+      e.cache_theme_group
+    ) AS theme_group,
+    COALESCE(
+      NULLIF(TRIM(COALESCE(e.cache_canonical_event_name, e.declaration_name)), ''),
+      'Unnamed'
+    ) AS event_name,
+    -- Mirrors sankey._normalize_name_groups: missing and LLM "Unnamed" groups both become
+    -- a per-type "Unnamed (<type>)" node so Gold and live graphs have the same shape.
+    CASE
+      WHEN COALESCE(NULLIF(TRIM(e.cache_name_group), ''), 'Unnamed') = 'Unnamed'
+        THEN IFF(TRIM(e.disaster_type) <> '', 'Unnamed (' || TRIM(e.disaster_type) || ')', 'Unnamed')
+      WHEN LOWER(TRIM(e.cache_name_group)) IN ('named', 'named event', 'named events')
+        THEN COALESCE(
+          NULLIF(TRIM(e.cache_canonical_event_name), ''),
+          NULLIF(TRIM(e.declaration_name), ''),
+          'Unnamed'
+        )
+      ELSE TRIM(e.cache_name_group)
+    END AS name_group
+  FROM enriched AS e
+  JOIN complete_years USING (year)
+),
+-- Fire declarations in the same state are grouped into clusters: a cluster starts at
+-- its earliest event date and absorbs every fire that begins within the next 92 days.
+fire_matches AS (
+  SELECT *
+  FROM (
+    SELECT
+      normalized.*,
+      COALESCE(disaster_begin_date, disaster_declaration_date, disaster_end_date) AS event_date
+    FROM normalized
+    WHERE LOWER(disaster_type) = 'fire'
+  )
+  MATCH_RECOGNIZE (
+    PARTITION BY year, state
+    ORDER BY event_date NULLS LAST, event_name
+    MEASURES MATCH_NUMBER() AS fire_cluster_id
+    ALL ROWS PER MATCH
+    PATTERN (cluster_start in_window*)
+    DEFINE
+      in_window AS event_date IS NULL
+        OR event_date < DATEADD('day', 93, FIRST(event_date))
+  )
+),
+fire_labels AS (
+  SELECT
+    year,
+    state,
+    fire_cluster_id,
+    'Fire Cluster ('
+      || LISTAGG(event_name, '; ') WITHIN GROUP (ORDER BY first_event_date NULLS LAST, event_name)
+      || ')' AS cluster_label
+  FROM (
+    SELECT year, state, fire_cluster_id, event_name, MIN(event_date) AS first_event_date
+    FROM fire_matches
+    GROUP BY year, state, fire_cluster_id, event_name
+  )
+  GROUP BY year, state, fire_cluster_id
+),
+labeled AS (
+  SELECT
+    year, disaster_type, theme_group, name_group, event_name, state, county_count,
+    disaster_declaration_date, disaster_begin_date, disaster_end_date
+  FROM normalized
+  WHERE LOWER(disaster_type) <> 'fire'
+  UNION ALL
+  SELECT
+    f.year, f.disaster_type, f.theme_group, l.cluster_label, f.event_name, f.state,
+    f.county_count, f.disaster_declaration_date, f.disaster_begin_date, f.disaster_end_date
+  FROM fire_matches AS f
+  JOIN fire_labels AS l
+    ON l.year = f.year
+   AND l.state = f.state
+   AND l.fire_cluster_id = f.fire_cluster_id
+)
+SELECT
+  year,
+  disaster_type,
+  theme_group,
+  name_group,
+  event_name,
+  state,
+  SUM(county_count) AS county_count,
+  MIN(disaster_begin_date) AS begin_date_min,
+  MAX(disaster_end_date) AS end_date_max,
+  MIN(disaster_declaration_date) AS declaration_date_min,
+  MAX(disaster_declaration_date) AS declaration_date_max
+FROM labeled
+GROUP BY year, disaster_type, theme_group, name_group, event_name, state;
+
+CREATE TABLE IF NOT EXISTS ANALYTICS.GOLD.SANKEY_FLOWS (
+  year NUMBER NOT NULL,
+  disaster_type STRING,
+  theme_group STRING,
+  name_group STRING,
+  event_name STRING,
+  state STRING,
+  county_count NUMBER,
+  begin_date_min DATE,
+  end_date_max DATE,
+  declaration_date_min DATE,
+  declaration_date_max DATE,
+  refreshed_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+)
+CLUSTER BY (year);
+
+CREATE OR REPLACE PROCEDURE ANALYTICS.GOLD.SP_REFRESH_SANKEY_FLOWS(target_year NUMBER)
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+  v_rows NUMBER;
+BEGIN
+  BEGIN TRANSACTION;
+  DELETE FROM ANALYTICS.GOLD.SANKEY_FLOWS
+  WHERE :target_year IS NULL OR year = :target_year;
+  INSERT INTO ANALYTICS.GOLD.SANKEY_FLOWS (
+    year, disaster_type, theme_group, name_group, event_name, state, county_count,
+    begin_date_min, end_date_max, declaration_date_min, declaration_date_max, refreshed_at
+  )
+  SELECT
+    year, disaster_type, theme_group, name_group, event_name, state, county_count,
+    begin_date_min, end_date_max, declaration_date_min, declaration_date_max,
+    CURRENT_TIMESTAMP()
+  FROM ANALYTICS.GOLD.V_SANKEY_FLOWS_SOURCE
+  WHERE :target_year IS NULL OR year = :target_year;
+  v_rows := SQLROWCOUNT;
+  COMMIT;
+  RETURN 'OK: ' || v_rows || ' rows';
+EXCEPTION
+  WHEN OTHER THEN
+    ROLLBACK;
+    RAISE;
+END;
+$$;
+
+-- Rebuilds only the current year (where Silver refreshes land) and materialized years
+-- whose cache rows changed after their flows were written. Years not in Gold yet are
+-- filled by the app and warmer script once their cache is complete.
+CREATE OR REPLACE PROCEDURE ANALYTICS.GOLD.SP_REFRESH_STALE_SANKEY_FLOWS()
+RETURNS STRING
+LANGUAGE SQL
+EXECUTE AS CALLER
+AS
+$$
+DECLARE
+  v_years NUMBER DEFAULT 0;
+  stale_years CURSOR FOR
+    WITH cache_changes AS (
+      SELECT
+        YEAR(COALESCE(d.disaster_declaration_date, d.disaster_begin_date, d.disaster_end_date)) AS year,
+        MAX(c.updated_at) AS cache_updated_at
+      FROM ANALYTICS.SILVER.FCT_DISASTERS AS d
+      -- Must match _SANKEY_RECORD_ID_SQL in app/queries.py.
+      JOIN ANALYTICS.MONITORING.DISASTER_NAME_GROUPING_CACHE AS c
+        ON c.record_id = SHA2(CONCAT(COALESCE(d.disaster_type, 'None'), '|', COALESCE(TRIM(d.declaration_name), ''), '|', COALESCE(TRIM(d.state), 'Unknown')), 256)
+      WHERE COALESCE(d.disaster_declaration_date, d.disaster_begin_date, d.disaster_end_date) IS NOT NULL
+      GROUP BY 1
+    ),
+    flows AS (
+      SELECT year, MAX(refreshed_at) AS refreshed_at
+      FROM ANALYTICS.GOLD.SANKEY_FLOWS
+      GROUP BY year
+    )
+    SELECT flows.year
+    FROM flows
+    LEFT JOIN cache_changes
+      ON cache_changes.year = flows.year
+    WHERE cache_changes.cache_updated_at > flows.refreshed_at
+    UNION
+    SELECT YEAR(CURRENT_DATE());
+BEGIN
+  FOR stale IN stale_years DO
+    LET v_year NUMBER := stale.year;
+    CALL ANALYTICS.GOLD.SP_REFRESH_SANKEY_FLOWS(:v_year);
+    v_years := v_years + 1;
+  END FOR;
+  RETURN 'OK: ' || v_years || ' years refreshed';
+END;
+$$;
+
+-- Picks up Silver refreshes and cache writes made outside the app or warmer script.
+CREATE OR REPLACE TASK ANALYTICS.GOLD.TASK_REFRESH_SANKEY_FLOWS_1H
+  WAREHOUSE = COMPUTE_WH
+  SCHEDULE = 'USING CRON 15 * * * * UTC'
+AS
+  CALL ANALYTICS.GOLD.SP_REFRESH_STALE_SANKEY_FLOWS();
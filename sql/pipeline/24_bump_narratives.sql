@@ -0,0 +1,16 @@
+-- Bump chart narratives: LLM summaries per (period, disaster type) cell, keyed on a hash
+-- of the prompt inputs and the model so stale or cross-model text is never served.
+
+CREATE SCHEMA IF NOT EXISTS ANALYTICS.MONITORING;
+
+CREATE TABLE IF NOT EXISTS ANALYTICS.MONITORING.BUMP_NARRATIVE_CACHE (
+  inputs_hash STRING NOT NULL,
+  llm_model STRING NOT NULL,
+  binning STRING,
+  period_bucket DATE,
+  disaster_type STRING,
+  narrative STRING,
+  created_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+  updated_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+  PRIMARY KEY (inputs_hash, llm_model)
+);